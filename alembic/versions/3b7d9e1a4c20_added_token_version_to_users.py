@@ -0,0 +1,37 @@
+"""added token_version to users
+
+Revision ID: 3b7d9e1a4c20
+Revises: fd219c5a0c77
+Create Date: 2026-10-18 10:12:41.305118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7d9e1a4c20"
+down_revision: Union[str, Sequence[str], None] = "fd219c5a0c77"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_version",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
@@ -0,0 +1,60 @@
+"""added trigram search indexes
+
+Revision ID: 5a9d3c7e2b18
+Revises: c4e81f0b7a36
+Create Date: 2026-10-18 13:04:52.117839
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a9d3c7e2b18"
+down_revision: Union[str, Sequence[str], None] = "c4e81f0b7a36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_exercise_name_trgm",
+            "exercise",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_workout_plans_title_trgm",
+            "workout_plans",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workout_plans_title_trgm",
+            table_name="workout_plans",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_exercise_name_trgm",
+            table_name="exercise",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,61 @@
+"""added refresh_tokens table
+
+Revision ID: 8f2c6a5d1e94
+Revises: 3b7d9e1a4c20
+Create Date: 2026-10-18 11:02:17.948213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2c6a5d1e94"
+down_revision: Union[str, Sequence[str], None] = "3b7d9e1a4c20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "token_digest", sa.String(length=64), nullable=False
+        ),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "expires_at", sa.TIMESTAMP(timezone=True), nullable=False
+        ),
+        sa.Column(
+            "revoked_at", sa.TIMESTAMP(timezone=True), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_token_digest"),
+        "refresh_tokens",
+        ["token_digest"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_refresh_tokens_token_digest"),
+        table_name="refresh_tokens",
+    )
+    op.drop_table("refresh_tokens")
@@ -0,0 +1,63 @@
+"""added table_versions for etags
+
+Revision ID: 9d4b2f6a8c13
+Revises: 5a9d3c7e2b18
+Create Date: 2026-10-18 16:21:08.413927
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b2f6a8c13"
+down_revision: Union[str, Sequence[str], None] = "5a9d3c7e2b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("exercise", "exercise_category", "workout_plans")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(length=63), nullable=False),
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version()
+        RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (name, version)
+            VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (name)
+            DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    for table in TABLES:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(
+            f"DROP TRIGGER IF EXISTS {table}_version ON {table}"
+        )
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table("table_versions")
@@ -0,0 +1,31 @@
+"""added refresh_tokens user_id index for pruning
+
+Revision ID: a5d1c9e3f7b2
+Revises: f4c8d2a6e9b3
+Create Date: 2026-10-18 20:14:37.218645
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a5d1c9e3f7b2"
+down_revision: Union[str, Sequence[str], None] = "f4c8d2a6e9b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_refresh_tokens_user_id", table_name="refresh_tokens"
+    )
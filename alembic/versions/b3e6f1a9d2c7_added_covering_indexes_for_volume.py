@@ -0,0 +1,78 @@
+"""added covering indexes for volume analytics
+
+Revision ID: b3e6f1a9d2c7
+Revises: 9d4b2f6a8c13
+Create Date: 2026-10-18 17:02:44.180356
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e6f1a9d2c7"
+down_revision: Union[str, Sequence[str], None] = "9d4b2f6a8c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workout_log_items_log_id_volume",
+            "workout_log_items",
+            ["log_id"],
+            postgresql_include=["exercise_id", "reps", "weight"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # same keys plus id, built before the old one goes away
+        op.create_index(
+            "ix_workout_log_user_id_started_at_id",
+            "workout_log",
+            ["user_id", "started_at"],
+            postgresql_include=["id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_workout_log_user_id_started_at",
+            table_name="workout_log",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute(
+        "ALTER INDEX ix_workout_log_user_id_started_at_id "
+        "RENAME TO ix_workout_log_user_id_started_at"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER INDEX ix_workout_log_user_id_started_at "
+        "RENAME TO ix_workout_log_user_id_started_at_id"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workout_log_user_id_started_at",
+            "workout_log",
+            ["user_id", "started_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_workout_log_user_id_started_at_id",
+            table_name="workout_log",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_workout_log_items_log_id_volume",
+            table_name="workout_log_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,87 @@
+"""added composite indexes for ownership-filtered queries
+
+Revision ID: c4e81f0b7a36
+Revises: 8f2c6a5d1e94
+Create Date: 2026-10-18 12:21:05.630472
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e81f0b7a36"
+down_revision: Union[str, Sequence[str], None] = "8f2c6a5d1e94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, columns, partial index predicate
+INDEXES: list[tuple[str, str, list[str], str | None]] = [
+    ("ix_exercise_owner_id", "exercise", ["owner_id", "id"], None),
+    ("ix_exercise_global", "exercise", ["id"], "is_global IS TRUE"),
+    (
+        "ix_workout_plans_user_id_created_at",
+        "workout_plans",
+        ["user_id", "created_at"],
+        None,
+    ),
+    (
+        "ix_workout_plans_public_created_at",
+        "workout_plans",
+        ["created_at"],
+        "is_public IS TRUE",
+    ),
+    (
+        "ix_workout_items_plan_id",
+        "workout_items",
+        ["plan_id", "id"],
+        None,
+    ),
+    (
+        "ix_scheduled_workout_user_id_scheduled_at",
+        "scheduled_workout",
+        ["user_id", "scheduled_at"],
+        None,
+    ),
+    (
+        "ix_workout_log_user_id_started_at",
+        "workout_log",
+        ["user_id", "started_at"],
+        None,
+    ),
+    (
+        "ix_workout_log_items_log_id_set_number",
+        "workout_log_items",
+        ["log_id", "set_number"],
+        None,
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,67 @@
+"""recompute only the personal records a deleted log held
+
+Revision ID: c8e5a2f9d4b1
+Revises: d2f7b4e8a1c6
+Create Date: 2026-10-18 22:14:37.218604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8e5a2f9d4b1"
+down_revision: Union[str, Sequence[str], None] = "d2f7b4e8a1c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION delete_log_items()
+        RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM workout_log_items WHERE log_id = OLD.id;
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute(
+        "CREATE OR REPLACE TRIGGER workout_log_delete_items "
+        "BEFORE DELETE ON workout_log "
+        "FOR EACH ROW EXECUTE FUNCTION delete_log_items()"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS workout_log_records_delete "
+        "ON workout_log"
+    )
+    op.execute("DROP FUNCTION IF EXISTS log_personal_records()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION log_personal_records()
+        RETURNS trigger AS $$
+        BEGIN
+            PERFORM recompute_personal_records(
+                array_agg(pr.user_id), array_agg(pr.exercise_id)
+            )
+            FROM personal_records pr
+            WHERE pr.user_id IN (SELECT user_id FROM old_logs);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute(
+        "CREATE OR REPLACE TRIGGER workout_log_records_delete "
+        "AFTER DELETE ON workout_log "
+        "REFERENCING OLD TABLE AS old_logs FOR EACH STATEMENT "
+        "EXECUTE FUNCTION log_personal_records()"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS workout_log_delete_items ON workout_log"
+    )
+    op.execute("DROP FUNCTION IF EXISTS delete_log_items()")
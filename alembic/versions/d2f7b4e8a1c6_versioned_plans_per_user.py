@@ -0,0 +1,45 @@
+"""versioned workout_plans per user with updated_at
+
+Revision ID: d2f7b4e8a1c6
+Revises: a5d1c9e3f7b2
+Create Date: 2026-10-18 20:52:19.604318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f7b4e8a1c6"
+down_revision: Union[str, Sequence[str], None] = "a5d1c9e3f7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "workout_plans",
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS workout_plans_version ON workout_plans"
+    )
+    op.execute("DELETE FROM table_versions WHERE name = 'workout_plans'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "CREATE OR REPLACE TRIGGER workout_plans_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON workout_plans "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+    )
+    op.drop_column("workout_plans", "updated_at")
@@ -0,0 +1,222 @@
+"""added personal_records maintained by triggers
+
+Revision ID: e7a2c4f8b1d5
+Revises: b3e6f1a9d2c7
+Create Date: 2026-10-18 17:48:12.507214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a2c4f8b1d5"
+down_revision: Union[str, Sequence[str], None] = "b3e6f1a9d2c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGGREGATES = """
+    max(i.weight),
+    (array_agg(i.reps ORDER BY i.weight DESC, i.reps DESC)
+        FILTER (WHERE i.weight IS NOT NULL))[1],
+    max(i.reps),
+    round(max(i.weight * (1 + i.reps / 30.0))
+        FILTER (WHERE i.reps <= 36), 2),
+    round(max(i.weight * 36 / (37 - i.reps))
+        FILTER (WHERE i.reps <= 36), 2),
+    now()
+"""
+
+COLUMNS = (
+    "user_id, exercise_id, max_weight, max_weight_reps, max_reps, "
+    "epley_1rm, brzycki_1rm, updated_at"
+)
+
+# name, table, event, transition tables, function
+TRIGGERS: list[tuple[str, str, str, str, str]] = [
+    (
+        "workout_log_items_records_insert",
+        "workout_log_items",
+        "INSERT",
+        "NEW TABLE AS new_items",
+        "log_items_personal_records",
+    ),
+    (
+        "workout_log_items_records_update",
+        "workout_log_items",
+        "UPDATE",
+        "OLD TABLE AS old_items NEW TABLE AS new_items",
+        "log_items_personal_records",
+    ),
+    (
+        "workout_log_items_records_delete",
+        "workout_log_items",
+        "DELETE",
+        "OLD TABLE AS old_items",
+        "log_items_personal_records",
+    ),
+    (
+        "workout_log_records_delete",
+        "workout_log",
+        "DELETE",
+        "OLD TABLE AS old_logs",
+        "log_personal_records",
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "personal_records",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), nullable=False),
+        sa.Column("max_weight", sa.DECIMAL(5, 2), nullable=True),
+        sa.Column("max_weight_reps", sa.Integer(), nullable=True),
+        sa.Column("max_reps", sa.Integer(), nullable=False),
+        sa.Column("epley_1rm", sa.DECIMAL(7, 2), nullable=True),
+        sa.Column("brzycki_1rm", sa.DECIMAL(7, 2), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["exercise_id"], ["exercise.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_id", "exercise_id"),
+    )
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION recompute_personal_records(
+            user_ids integer[], exercise_ids integer[]
+        ) RETURNS void AS $$
+        BEGIN
+            DELETE FROM personal_records pr
+            USING unnest(user_ids, exercise_ids)
+                AS p(user_id, exercise_id)
+            WHERE pr.user_id = p.user_id
+                AND pr.exercise_id = p.exercise_id;
+            INSERT INTO personal_records ({COLUMNS})
+            SELECT l.user_id, i.exercise_id, {AGGREGATES}
+            FROM unnest(user_ids, exercise_ids)
+                AS p(user_id, exercise_id)
+            JOIN workout_log l ON l.user_id = p.user_id
+            JOIN workout_log_items i
+                ON i.log_id = l.id AND i.exercise_id = p.exercise_id
+            WHERE i.reps > 0
+            GROUP BY l.user_id, i.exercise_id;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION log_items_personal_records()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO personal_records AS pr ({COLUMNS})
+                SELECT l.user_id, i.exercise_id, {AGGREGATES}
+                FROM new_items i
+                JOIN workout_log l ON l.id = i.log_id
+                WHERE i.exercise_id IS NOT NULL AND i.reps > 0
+                GROUP BY l.user_id, i.exercise_id
+                ON CONFLICT (user_id, exercise_id) DO UPDATE SET
+                    max_weight_reps = CASE
+                        WHEN pr.max_weight IS NULL
+                            OR excluded.max_weight > pr.max_weight
+                            THEN excluded.max_weight_reps
+                        WHEN excluded.max_weight = pr.max_weight
+                            THEN greatest(
+                                pr.max_weight_reps,
+                                excluded.max_weight_reps
+                            )
+                        ELSE pr.max_weight_reps
+                    END,
+                    max_weight = greatest(
+                        pr.max_weight, excluded.max_weight
+                    ),
+                    max_reps = greatest(pr.max_reps, excluded.max_reps),
+                    epley_1rm = greatest(
+                        pr.epley_1rm, excluded.epley_1rm
+                    ),
+                    brzycki_1rm = greatest(
+                        pr.brzycki_1rm, excluded.brzycki_1rm
+                    ),
+                    updated_at = excluded.updated_at;
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM recompute_personal_records(
+                    array_agg(pairs.user_id),
+                    array_agg(pairs.exercise_id)
+                )
+                FROM (
+                    SELECT DISTINCT l.user_id, i.exercise_id
+                    FROM (
+                        SELECT log_id, exercise_id FROM old_items
+                        UNION SELECT log_id, exercise_id FROM new_items
+                    ) i
+                    JOIN workout_log l ON l.id = i.log_id
+                    WHERE i.exercise_id IS NOT NULL
+                ) pairs;
+            ELSE
+                PERFORM recompute_personal_records(
+                    array_agg(pairs.user_id),
+                    array_agg(pairs.exercise_id)
+                )
+                FROM (
+                    SELECT DISTINCT l.user_id, i.exercise_id
+                    FROM old_items i
+                    JOIN workout_log l ON l.id = i.log_id
+                    WHERE i.exercise_id IS NOT NULL
+                ) pairs;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION log_personal_records()
+        RETURNS trigger AS $$
+        BEGIN
+            PERFORM recompute_personal_records(
+                array_agg(pr.user_id), array_agg(pr.exercise_id)
+            )
+            FROM personal_records pr
+            WHERE pr.user_id IN (SELECT user_id FROM old_logs);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    for name, table, event, transition, function in TRIGGERS:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {name} "
+            f"AFTER {event} ON {table} "
+            f"REFERENCING {transition} FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION {function}()"
+        )
+    # records of the history logged before the triggers existed
+    op.execute(f"""
+        INSERT INTO personal_records ({COLUMNS})
+        SELECT l.user_id, i.exercise_id, {AGGREGATES}
+        FROM workout_log_items i
+        JOIN workout_log l ON l.id = i.log_id
+        WHERE i.exercise_id IS NOT NULL AND i.reps > 0
+        GROUP BY l.user_id, i.exercise_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _, _ in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS log_personal_records()")
+    op.execute("DROP FUNCTION IF EXISTS log_items_personal_records()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "recompute_personal_records(integer[], integer[])"
+    )
+    op.drop_table("personal_records")
@@ -0,0 +1,77 @@
+"""merged the workout_log_items volume index into the set_number one
+
+Revision ID: e9b4d1c7a3f6
+Revises: c8e5a2f9d4b1
+Create Date: 2026-10-18 22:41:05.663190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e9b4d1c7a3f6"
+down_revision: Union[str, Sequence[str], None] = "c8e5a2f9d4b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        # same keys plus the volume columns, built before the old ones
+        # go away
+        op.create_index(
+            "ix_workout_log_items_log_id_set_number_cover",
+            "workout_log_items",
+            ["log_id", "set_number"],
+            postgresql_include=["exercise_id", "reps", "weight"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name in (
+            "ix_workout_log_items_log_id_set_number",
+            "ix_workout_log_items_log_id_volume",
+        ):
+            op.drop_index(
+                name,
+                table_name="workout_log_items",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.execute(
+        "ALTER INDEX ix_workout_log_items_log_id_set_number_cover "
+        "RENAME TO ix_workout_log_items_log_id_set_number"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER INDEX ix_workout_log_items_log_id_set_number "
+        "RENAME TO ix_workout_log_items_log_id_set_number_cover"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workout_log_items_log_id_set_number",
+            "workout_log_items",
+            ["log_id", "set_number"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_workout_log_items_log_id_volume",
+            "workout_log_items",
+            ["log_id"],
+            postgresql_include=["exercise_id", "reps", "weight"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_workout_log_items_log_id_set_number_cover",
+            table_name="workout_log_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
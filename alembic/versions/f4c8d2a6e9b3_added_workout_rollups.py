@@ -0,0 +1,174 @@
+"""added workout_rollups with change tracking
+
+Revision ID: f4c8d2a6e9b3
+Revises: e7a2c4f8b1d5
+Create Date: 2026-10-18 18:36:50.941208
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f4c8d2a6e9b3"
+down_revision: Union[str, Sequence[str], None] = "e7a2c4f8b1d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("workout_log", "workout_log_items", "scheduled_workout")
+
+TRANSITIONS = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rollup_changes",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "txid",
+            sa.BigInteger(),
+            server_default=sa.text(
+                "pg_current_xact_id()::text::bigint"
+            ),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("touched_on", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_rollup_changes_txid", "rollup_changes", ["txid"]
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=63), nullable=False),
+        sa.Column("txid", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "refreshed_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "workout_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("period", sa.String(length=5), nullable=False),
+        sa.Column("bucket", sa.Date(), nullable=False),
+        sa.Column("workouts", sa.Integer(), nullable=False),
+        sa.Column(
+            "duration_seconds", sa.BigInteger(), nullable=False
+        ),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("volume", sa.DECIMAL(14, 2), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("missed", sa.Integer(), nullable=False),
+        sa.Column(
+            "refreshed_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_id", "period", "bucket"),
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_rollup_changes()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_TABLE_NAME = 'workout_log' THEN
+                IF TG_OP <> 'DELETE' THEN
+                    INSERT INTO rollup_changes (user_id, touched_on)
+                    SELECT DISTINCT user_id,
+                        (started_at AT TIME ZONE 'UTC')::date
+                    FROM new_rows WHERE started_at IS NOT NULL;
+                END IF;
+                IF TG_OP <> 'INSERT' THEN
+                    INSERT INTO rollup_changes (user_id, touched_on)
+                    SELECT DISTINCT user_id,
+                        (started_at AT TIME ZONE 'UTC')::date
+                    FROM old_rows WHERE started_at IS NOT NULL;
+                END IF;
+            ELSIF TG_TABLE_NAME = 'scheduled_workout' THEN
+                IF TG_OP <> 'DELETE' THEN
+                    INSERT INTO rollup_changes (user_id, touched_on)
+                    SELECT DISTINCT user_id,
+                        (scheduled_at AT TIME ZONE 'UTC')::date
+                    FROM new_rows
+                    WHERE scheduled_at IS NOT NULL AND user_id IS NOT NULL;
+                END IF;
+                IF TG_OP <> 'INSERT' THEN
+                    INSERT INTO rollup_changes (user_id, touched_on)
+                    SELECT DISTINCT user_id,
+                        (scheduled_at AT TIME ZONE 'UTC')::date
+                    FROM old_rows
+                    WHERE scheduled_at IS NOT NULL AND user_id IS NOT NULL;
+                END IF;
+            ELSE
+                IF TG_OP <> 'DELETE' THEN
+                    INSERT INTO rollup_changes (user_id, touched_on)
+                    SELECT DISTINCT l.user_id,
+                        (l.started_at AT TIME ZONE 'UTC')::date
+                    FROM new_rows i
+                    JOIN workout_log l ON l.id = i.log_id
+                    WHERE l.started_at IS NOT NULL;
+                END IF;
+                IF TG_OP <> 'INSERT' THEN
+                    INSERT INTO rollup_changes (user_id, touched_on)
+                    SELECT DISTINCT l.user_id,
+                        (l.started_at AT TIME ZONE 'UTC')::date
+                    FROM old_rows i
+                    JOIN workout_log l ON l.id = i.log_id
+                    WHERE l.started_at IS NOT NULL;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    for table in TABLES:
+        for operation, transition in TRANSITIONS.items():
+            op.execute(
+                f"CREATE OR REPLACE TRIGGER "
+                f"{table}_rollup_{operation.lower()} "
+                f"AFTER {operation} ON {table} "
+                f"REFERENCING {transition} FOR EACH STATEMENT "
+                "EXECUTE FUNCTION record_rollup_changes()"
+            )
+    # the first refresh builds the rollups of the existing history
+    op.execute("""
+        INSERT INTO rollup_changes (user_id, touched_on)
+        SELECT DISTINCT user_id, (started_at AT TIME ZONE 'UTC')::date
+        FROM workout_log WHERE started_at IS NOT NULL
+        UNION
+        SELECT DISTINCT user_id, (scheduled_at AT TIME ZONE 'UTC')::date
+        FROM scheduled_workout
+        WHERE scheduled_at IS NOT NULL AND user_id IS NOT NULL
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for operation in TRANSITIONS:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS "
+                f"{table}_rollup_{operation.lower()} ON {table}"
+            )
+    op.execute("DROP FUNCTION IF EXISTS record_rollup_changes()")
+    op.drop_table("workout_rollups")
+    op.drop_table("rollup_watermarks")
+    op.drop_index(
+        "ix_rollup_changes_txid", table_name="rollup_changes"
+    )
+    op.drop_table("rollup_changes")
@@ -0,0 +1,43 @@
+# path fix to be able to run benchmark script
+import argparse
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from utility.hash import (  # noqa: E402
+    MAX_ROUNDS,
+    MIN_ROUNDS,
+    calibrate_rounds,
+    time_hash,
+)
+from settings import settings  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report bcrypt hashes/sec per cost on this machine"
+    )
+    parser.add_argument("--min", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max", type=int, default=MAX_ROUNDS - 2)
+    parser.add_argument(
+        "--target-ms", type=float, default=settings.BCRYPT_TARGET_MS
+    )
+    args = parser.parse_args()
+
+    print(f"{'cost':>4} {'ms/hash':>10} {'hashes/sec':>11}")
+    for rounds in range(args.min, args.max + 1):
+        seconds = time_hash(rounds)
+        print(
+            f"{rounds:>4} {seconds * 1000:>10.1f} {1 / seconds:>11.2f}"
+        )
+    print(
+        f"calibrated cost for {args.target_ms:.0f} ms target: "
+        f"{calibrate_rounds(args.target_ms)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
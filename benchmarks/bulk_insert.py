@@ -0,0 +1,95 @@
+# path fix to be able to run benchmark script
+import argparse
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from database import sessionLocal  # noqa: E402
+from schemas.models import WorkoutItems, WorkoutLogItems  # noqa: E402
+
+SIZES = (1, 10, 100, 1000)
+
+
+def rows(table, size: int, args) -> list[dict]:
+    if table is WorkoutItems:
+        return [
+            {
+                "plan_id": args.plan_id,
+                "exercise_id": args.exercise_id,
+                "sets": 4,
+                "reps": "10",
+                "weight": 50,
+                "rest_seconds": 60,
+            }
+            for _ in range(size)
+        ]
+    return [
+        {
+            "log_id": args.log_id,
+            "exercise_id": args.exercise_id,
+            "set_number": number + 1,
+            "reps": 10,
+            "weight": 50,
+        }
+        for number in range(size)
+    ]
+
+
+def orm_add(db: Session, table, values: list[dict]) -> None:
+    objects = [table(**row) for row in values]
+    db.add_all(objects)
+    db.flush()
+    # ids of the created objects, as the old endpoints returned them
+    [obj.id for obj in objects]
+
+
+def insert_returning(db: Session, table, values: list[dict]) -> None:
+    db.execute(insert(table).values(values).returning(table.id)).all()
+
+
+def measure(func, table, size: int, args) -> float:
+    values = rows(table, size, args)
+    timings = []
+    for _ in range(args.repeat):
+        with sessionLocal() as db:
+            start = time.perf_counter()
+            func(db, table, values)
+            timings.append(time.perf_counter() - start)
+            db.rollback()
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per row ORM inserts with one INSERT "
+        "... RETURNING for workout and log items"
+    )
+    parser.add_argument("--plan-id", type=int, required=True)
+    parser.add_argument("--log-id", type=int, required=True)
+    parser.add_argument("--exercise-id", type=int, required=True)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'table':>18} {'items':>6} {'orm ms':>9} {'insert ms':>10}"
+    )
+    for table in (WorkoutItems, WorkoutLogItems):
+        for size in SIZES:
+            orm = measure(orm_add, table, size, args)
+            single = measure(insert_returning, table, size, args)
+            print(
+                f"{table.__tablename__:>18} {size:>6} "
+                f"{orm:>9.2f} {single:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# path fix to be able to run benchmark script
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ["/exercise/", "/workout_log/"]
+
+
+def start_server(db_async: bool, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DB_ASYNC": "true" if db_async else "false"}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+async def run_load(
+    base_url: str,
+    path: str,
+    token: str,
+    requests: int,
+    concurrency: int,
+) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            await client.get(path, headers=headers)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(client) for _ in range(concurrency))
+        )
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare sync and async database modes"
+    )
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--port", type=int, default=7100)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'endpoint':>14} {'req/sec':>10}")
+    for db_async in (False, True):
+        server = start_server(db_async, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            token = httpx.post(
+                f"{base_url}/users/login",
+                json={"email": args.email, "password": args.password},
+            ).json()["access_token"]
+            for path in ENDPOINTS:
+                rps = asyncio.run(
+                    run_load(
+                        base_url,
+                        path,
+                        token,
+                        args.requests,
+                        args.concurrency,
+                    )
+                )
+                mode = "async" if db_async else "sync"
+                print(f"{mode:>6} {path:>14} {rps:>10.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# path fix to be able to run benchmark script
+import argparse
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from sqlalchemy import RowMapping  # noqa: E402
+from sqlalchemy.engine import result_tuple  # noqa: E402
+
+from schemas.schemas import (
+    WorkoutLogResponse,
+    WorkoutStatus,
+)  # noqa: E402
+from utility.serialization import RowSerializer, orjson  # noqa: E402
+
+SIZES = (20, 1000, 50000)
+COLUMNS = [
+    "plan_name",
+    "scheduled_title",
+    "status",
+    "scheduled",
+    "started_at",
+    "ended_at",
+    "notes",
+    "cursor_0",
+    "cursor_1",
+]
+
+
+# RowMapping objects like the ones the list routes get from the database
+def make_rows(size: int) -> list[RowMapping]:
+    make_row = result_tuple(COLUMNS)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for number in range(size):
+        started = start + timedelta(hours=number)
+        rows.append(
+            make_row(
+                [
+                    "Push day",
+                    "Morning session",
+                    WorkoutStatus.done,
+                    started,
+                    started,
+                    started + timedelta(hours=1),
+                    "felt good",
+                    started,
+                    number,
+                ]
+            )._mapping
+        )
+    return rows
+
+
+def cpu_ms(func, rows, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func(rows)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="CPU per response for validated and direct row "
+        "serialization"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    serializer = RowSerializer(WorkoutLogResponse)
+    print(f"orjson: {'yes' if orjson else 'no, pydantic_core'}")
+    print(
+        f"{'rows':>6} {'validated ms':>13} {'fast ms':>9} {'speedup':>8}"
+    )
+    for size in SIZES:
+        rows = make_rows(size)
+        repeat = max(1, args.repeat * 1000 // max(size, 1000))
+        before = cpu_ms(serializer.validated, rows, repeat)
+        after = cpu_ms(serializer.dump, rows, repeat)
+        print(
+            f"{size:>6} {before:>13.3f} {after:>9.3f} "
+            f"{before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# path fix to be able to run benchmark script
+import argparse
+import random
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from utility.analytics import (  # noqa: E402
+    SECONDS_PER_DAY,
+    TrainingSets,
+    progression,
+)
+
+SIZES = (10_000, 100_000, 500_000)
+EXERCISES = 40
+SETS_PER_SESSION = 4
+
+
+# rows like the ones sets_query returns: (epoch, exercise, reps, weight)
+def make_rows(size: int, now: float) -> list[tuple]:
+    rng = random.Random(size)
+    rows = []
+    sessions = size // SETS_PER_SESSION
+    for session in range(sessions):
+        started = now - (sessions - session) * SECONDS_PER_DAY / 3
+        exercise = rng.randrange(EXERCISES)
+        weight = 40 + exercise + session * 0.01
+        for _ in range(SETS_PER_SESSION):
+            rows.append(
+                (
+                    started,
+                    exercise,
+                    rng.randint(3, 12),
+                    round(weight + rng.uniform(-5, 5), 2),
+                )
+            )
+    return rows
+
+
+# the same session bests as progression, one set at a time
+def python_sessions(rows: list[tuple]) -> dict:
+    best: dict[tuple, float] = {}
+    for started, exercise, reps, weight in rows:
+        key = (exercise, started // SECONDS_PER_DAY)
+        e1rm = weight * (1 + reps / 30)
+        if e1rm > best.get(key, 0):
+            best[key] = e1rm
+    return best
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Wall time of the progression analytics per user"
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    now = time.time()
+    print(
+        f"{'sets':>7} {'load ms':>8} {'numpy ms':>9} "
+        f"{'python sessions ms':>19}"
+    )
+    for size in SIZES:
+        rows = make_rows(size, now)
+        sets = TrainingSets.from_rows(rows)
+        load = median_ms(
+            lambda: TrainingSets.from_rows(rows), args.repeat
+        )
+        numpy = median_ms(lambda: progression(sets, now), args.repeat)
+        loop = median_ms(lambda: python_sessions(rows), args.repeat)
+        print(f"{size:>7} {load:>8.2f} {numpy:>9.2f} {loop:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,91 @@
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.orm import sessionmaker
 from settings import settings
+from utility.pool_metrics import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    attach_pool_metrics,
+)
+from utility.replicas import RecentWrites, ReplicaSelector
 
 SQL_ALCHEMY_DB_URL: str = settings.DATABASE_URL
 
-engine = create_engine(SQL_ALCHEMY_DB_URL)
+
+def to_async_url(url: str) -> str:
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .render_as_string(hide_password=False)
+    )
+
+
+# same database through asyncpg unless a separate url is configured
+ASYNC_DB_URL: str = settings.ASYNC_DATABASE_URL or to_async_url(
+    SQL_ALCHEMY_DB_URL
+)
+
+
+def pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(
+    SQL_ALCHEMY_DB_URL,
+    poolclass=TimedQueuePool,
+    pool_logging_name="primary",
+    **pool_options(),
+)
+attach_pool_metrics(engine, "primary")
 
 sessionLocal = sessionmaker(autoflush=False, bind=engine)
 
+replica_engines: list[Engine] = []
+for number, url in enumerate(settings.DATABASE_REPLICA_URLS):
+    replica_engines.append(
+        create_engine(
+            url,
+            poolclass=TimedQueuePool,
+            pool_logging_name=f"replica{number}",
+            **pool_options(),
+        )
+    )
+    attach_pool_metrics(replica_engines[-1], f"replica{number}")
+
+replicas = ReplicaSelector(replica_engines, settings.REPLICA_STRATEGY)
+recent_writes = RecentWrites(settings.READ_YOUR_WRITES_SECONDS)
+
+# async engine is only built when the async code path is enabled
+async_engine = (
+    create_async_engine(
+        ASYNC_DB_URL,
+        poolclass=TimedAsyncQueuePool,
+        pool_logging_name="primary_async",
+        **pool_options(),
+    )
+    if settings.DB_ASYNC
+    else None
+)
+if async_engine is not None:
+    attach_pool_metrics(async_engine.sync_engine, "primary_async")
+
+asyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -18,3 +95,49 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class ReadSession(Session):
+    """
+    Reads from a replica unless the user wrote a moment ago. The engine
+    is picked on first use, by then the route's auth dependency has put
+    the user id on request.state.
+    """
+
+    def __init__(self, request: Request, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.request = request
+        self.read_engine: Engine | None = None
+
+    def get_bind(self, *args, **kwargs) -> Engine:
+        if self.read_engine is None:
+            user_id: int | None = getattr(
+                self.request.state, "user_id", None
+            )
+            replica: Engine | None = None
+            if user_id is None or not recent_writes.is_recent(
+                user_id
+            ):
+                replica = replicas.pick()
+            self.read_engine = replica or engine
+        return self.read_engine
+
+
+def read_session(request: Request) -> Session:
+    return ReadSession(request, autoflush=False, bind=engine)
+
+
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    db: AsyncSession = asyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import FastAPI, Request
 import schemas.models as models
 import database
 from routers import (
+    analytics,
+    async_reads,
     exercises,
+    export,
+    metrics,
+    records,
     scheduled,
     users,
     workout_items,
@@ -10,10 +19,108 @@ from routers import (
     workout_log_items,
     workouts,
 )
+from fastapi.concurrency import run_in_threadpool
+from settings import settings
+from utility.catalog import catalog
+from utility.hash import hash_pool
+from utility.revocation import revocations
+from utility.rollups import rollups
+from utility.sql_metrics import (
+    RequestStats,
+    current_stats,
+    finish_request,
+)
+
+logger = logging.getLogger(__name__)
 
 models.Base.metadata.create_all(database.engine)
 
-app = FastAPI()
+
+def load_revocations() -> None:
+    with database.sessionLocal() as db:
+        revocations.load(db)
+
+
+def load_catalog() -> None:
+    with database.sessionLocal() as db:
+        catalog.load(db)
+
+
+def refresh_rollups_once() -> None:
+    with database.sessionLocal() as db:
+        rollups.refresh(db)
+
+
+# picks up logouts and deactivations made by other workers
+async def refresh_revocations() -> None:
+    while True:
+        await asyncio.sleep(settings.AUTH_REVOCATION_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(load_revocations)
+        except Exception:
+            logger.exception("Failed to refresh token revocations")
+
+
+# folds the writes since the last run into workout_rollups
+async def refresh_rollups() -> None:
+    while True:
+        await asyncio.sleep(settings.ROLLUP_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_rollups_once)
+        except Exception:
+            logger.exception("Failed to refresh workout rollups")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # a sync route holds its thread while it waits for a connection, so
+    # more threads than pooled connections only queue inside the pool
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.THREADPOOL_TOKENS
+        or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    await run_in_threadpool(load_revocations)
+    await run_in_threadpool(load_catalog)
+    refresher = asyncio.create_task(refresh_revocations())
+    rollup_refresher = asyncio.create_task(refresh_rollups())
+    yield
+    refresher.cancel()
+    rollup_refresher.cancel()
+    hash_pool.shutdown()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.middleware("http")
+async def sql_timing(request: Request, call_next):
+    stats = RequestStats()
+    token = current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        current_stats.reset(token)
+    route = request.scope.get("route")
+    path: str = route.path if route else request.url.path
+    finish_request(f"{request.method} {path}", stats)
+    response.headers["Server-Timing"] = stats.server_timing()
+    return response
+
+
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    response = await call_next(request)
+    # set by get_current_user, failed writes changed nothing to wait for
+    user_id: int | None = getattr(request.state, "user_id", None)
+    if (
+        user_id is not None
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        database.recent_writes.mark(user_id)
+    return response
 
 
 @app.get("/")
@@ -21,6 +128,9 @@ def main():
     return {"data": "hello"}
 
 
+# async list endpoints take precedence over their sync twins
+if settings.DB_ASYNC:
+    app.include_router(async_reads.router)
 app.include_router(users.router)
 app.include_router(exercises.router)
 app.include_router(workouts.router)
@@ -28,3 +138,9 @@ app.include_router(workout_items.router)
 app.include_router(scheduled.router)
 app.include_router(workout_log.router)
 app.include_router(workout_log_items.router)
+app.include_router(export.router)
+app.include_router(analytics.router)
+app.include_router(records.router)
+# unauthenticated internals, only for deployments that keep them private
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
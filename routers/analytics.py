@@ -0,0 +1,209 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Literal, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import (
+    Date,
+    Interval,
+    RowMapping,
+    Select,
+    and_,
+    cast,
+    func,
+    literal,
+    select,
+    true,
+)
+from sqlalchemy.orm import Session
+from database import get_read_db
+from schemas.models import (
+    Exercise,
+    WorkoutLog,
+    WorkoutLogItems,
+    WorkoutRollup,
+)
+from schemas.schemas import (
+    ProgressionResponse,
+    RollupResponse,
+    VolumePoint,
+)
+from utility.analytics import ROLLING_SESSIONS, user_progression
+from utility.oauth2 import get_current_user
+from utility.rollups import Period, period_start
+from utility.serialization import RowSerializer, render_rows
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+volume_rows = RowSerializer(VolumePoint)
+rollup_rows = RowSerializer(RollupResponse)
+
+Bucket = Literal["day", "week", "month"]
+BUCKET_DAYS: dict[str, int] = {"day": 1, "week": 7, "month": 28}
+# upper bound of points per exercise in one response
+MAX_BUCKETS = 1000
+DEFAULT_RANGE_DAYS = 365
+
+
+def volume_query(
+    user_id: int,
+    bucket: Bucket,
+    start: date,
+    end: date,
+    exercise_id: Optional[int] = None,
+) -> Select:
+    """
+    Sets, reps and volume (reps * weight summed over the sets) per
+    exercise and bucket between start and end, both inclusive, in UTC.
+    Buckets without sets are filled in with zeros by generate_series.
+    """
+    utc_started = func.timezone("UTC", WorkoutLog.started_at)
+    truncated = func.date_trunc(bucket, utc_started)
+    totals = (
+        select(
+            truncated.label("bucket"),
+            WorkoutLogItems.exercise_id,
+            func.count().label("sets"),
+            func.sum(WorkoutLogItems.reps).label("reps"),
+            func.sum(
+                WorkoutLogItems.reps * WorkoutLogItems.weight
+            ).label("volume"),
+        )
+        .join_from(WorkoutLog, WorkoutLogItems, WorkoutLog.items)
+        .where(
+            WorkoutLog.user_id == user_id,
+            WorkoutLog.started_at
+            >= datetime.combine(start, time(), timezone.utc),
+            WorkoutLog.started_at
+            < datetime.combine(
+                end + timedelta(days=1), time(), timezone.utc
+            ),
+            WorkoutLogItems.exercise_id.isnot(None),
+        )
+        # by the output name, a repeated date_trunc(:bucket, ...) would
+        # be a different expression to Postgres with server side binds
+        .group_by("bucket", WorkoutLogItems.exercise_id)
+    )
+    if exercise_id is not None:
+        totals = totals.where(
+            WorkoutLogItems.exercise_id == exercise_id
+        )
+    totals = totals.cte("totals")
+
+    series = select(
+        func.generate_series(
+            func.date_trunc(bucket, datetime.combine(start, time())),
+            func.date_trunc(bucket, datetime.combine(end, time())),
+            cast(literal(f"1 {bucket}"), Interval),
+        ).label("bucket")
+    ).cte("series")
+    exercises = (
+        select(totals.c.exercise_id, Exercise.name)
+        .join(Exercise, Exercise.id == totals.c.exercise_id)
+        .distinct()
+        .cte("exercises")
+    )
+    return (
+        select(
+            cast(series.c.bucket, Date).label("bucket"),
+            exercises.c.exercise_id,
+            exercises.c.name.label("exercise"),
+            func.coalesce(totals.c.sets, 0).label("sets"),
+            func.coalesce(totals.c.reps, 0).label("reps"),
+            func.coalesce(totals.c.volume, 0).label("volume"),
+        )
+        .select_from(series)
+        .join(exercises, true())
+        .outerjoin(
+            totals,
+            and_(
+                totals.c.bucket == series.c.bucket,
+                totals.c.exercise_id == exercises.c.exercise_id,
+            ),
+        )
+        .order_by(exercises.c.exercise_id, series.c.bucket)
+    )
+
+
+def resolve_range(
+    start: Optional[date], end: Optional[date], bucket: Bucket
+) -> tuple[date, date]:
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS)
+    if start > end:
+        raise HTTPException(
+            status_code=400, detail="start has to be before end"
+        )
+    if (end - start).days // BUCKET_DAYS[bucket] >= MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range is longer than {MAX_BUCKETS} buckets",
+        )
+    return start, end
+
+
+@router.get("/volume", response_model=List[VolumePoint])
+def get_volume(
+    response: Response,
+    bucket: Bucket = Query(default="week"),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    exercise_id: Optional[int] = Query(default=None),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+) -> Sequence[RowMapping] | Response:
+    start, end = resolve_range(start, end, bucket)
+    rows: Sequence[RowMapping] = (
+        db.execute(
+            volume_query(
+                current_user.id, bucket, start, end, exercise_id
+            )
+        )
+        .mappings()
+        .all()
+    )
+    return render_rows(volume_rows, rows, response)
+
+
+# reads only workout_rollups, so it lags writes by up to
+# ROLLUP_REFRESH_SECONDS
+@router.get("/summary", response_model=List[RollupResponse])
+def get_summary(
+    response: Response,
+    period: Period = Query(default="week"),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+) -> Sequence[RowMapping] | Response:
+    start, end = resolve_range(start, end, period)
+    rows: Sequence[RowMapping] = (
+        db.execute(
+            select(
+                WorkoutRollup.bucket,
+                WorkoutRollup.workouts,
+                WorkoutRollup.duration_seconds,
+                WorkoutRollup.sets,
+                WorkoutRollup.volume,
+                WorkoutRollup.completed,
+                WorkoutRollup.missed,
+            )
+            .where(
+                WorkoutRollup.user_id == current_user.id,
+                WorkoutRollup.period == period,
+                WorkoutRollup.bucket >= period_start(period, start),
+                WorkoutRollup.bucket <= end,
+            )
+            .order_by(WorkoutRollup.bucket)
+        )
+        .mappings()
+        .all()
+    )
+    return render_rows(rollup_rows, rows, response)
+
+
+@router.get("/progression", response_model=ProgressionResponse)
+def get_progression(
+    window: int = Query(default=ROLLING_SESSIONS, ge=2, le=20),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+) -> dict:
+    return user_progression(db, current_user.id, window)
@@ -0,0 +1,191 @@
+from typing import Annotated, List, Optional, Sequence
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from sqlalchemy import RowMapping, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from routers.exercises import (
+    EXERCISE_TABLES,
+    exercise_rows,
+    exercises_query,
+)
+from routers.scheduled import schedule_rows, schedules_query
+from routers.workout_items import item_rows, items_query
+from routers.workout_log import log_rows, logs_query
+from routers.workouts import (
+    plan_rows,
+    plan_versions,
+    plans_query,
+)
+from schemas.schemas import (
+    ExerciseResponse,
+    PaginationParams,
+    ScheduledWorkoutGetResponse,
+    WorkoutItemsResponse,
+    WorkoutLogResponse,
+    WorkoutPlanResponse,
+)
+from utility.catalog import catalog
+from utility.etag import not_modified, versions_query
+from utility.oauth2 import (
+    get_current_user_async,
+    get_optional_user_async,
+)
+from utility.pagination import set_next_cursor
+from utility.serialization import RowSerializer, render_rows
+from utility.search import DEFAULT_THRESHOLD, threshold_statement
+
+# async twins of the list endpoints, mounted in front of the sync
+# routers when DB_ASYNC is enabled. Queries are shared with the sync
+# routers, only the execution differs.
+router = APIRouter(tags=["Async reads"])
+
+PaginationDep = Annotated[PaginationParams, Depends(PaginationParams)]
+
+
+async def fetch_all(
+    db: AsyncSession,
+    query: Select,
+    detail: str,
+    response: Response,
+    pagination: PaginationParams,
+    serializer: RowSerializer,
+) -> Sequence[RowMapping] | Response:
+    rows: Sequence[RowMapping] = (
+        (await db.execute(query)).mappings().all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail=detail)
+    set_next_cursor(response, rows, pagination)
+    return render_rows(serializer, rows, response)
+
+
+@router.get("/exercise/", response_model=List[ExerciseResponse])
+async def get_all_exercises_for_user_async(
+    pagination: PaginationDep,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_optional_user_async),
+    search: Optional[str] = Query(default="", alias="name"),
+    threshold: float = Query(default=DEFAULT_THRESHOLD, gt=0, le=1),
+) -> Sequence[RowMapping] | Response:
+    versions = (
+        await db.execute(versions_query(EXERCISE_TABLES))
+    ).all()
+    cached = not_modified(request, response, versions, current_user)
+    if cached:
+        return cached
+    if not current_user:
+        snapshot = catalog.fresh(versions) or await db.run_sync(
+            catalog.load
+        )
+        exercises = snapshot.list(pagination, search, threshold)
+        if not exercises:
+            raise HTTPException(
+                status_code=404, detail="Exercises are not found"
+            )
+        set_next_cursor(response, exercises, pagination)
+        return render_rows(exercise_rows, exercises, response)
+    if search and threshold != DEFAULT_THRESHOLD:
+        await db.execute(threshold_statement(threshold))
+    return await fetch_all(
+        db,
+        exercises_query(pagination, current_user, search),
+        "Exercises are not found",
+        response,
+        pagination,
+        exercise_rows,
+    )
+
+
+@router.get(
+    "/workoutplans/", response_model=List[WorkoutPlanResponse]
+)
+async def get_workout_plan_async(
+    pagination: PaginationDep,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_optional_user_async),
+) -> Sequence[RowMapping] | Response:
+    query = plans_query(pagination, current_user)
+    workout: Sequence[RowMapping] = (
+        (await db.execute(query)).mappings().all()
+    )
+    if not workout:
+        raise HTTPException(
+            status_code=404, detail="Workout plans doesn't exists"
+        )
+    set_next_cursor(response, workout, pagination)
+    cached = not_modified(
+        request, response, plan_versions(workout), current_user
+    )
+    if cached:
+        return cached
+    return render_rows(plan_rows, workout, response)
+
+
+@router.get(
+    "/scheduled/", response_model=List[ScheduledWorkoutGetResponse]
+)
+async def get_all_dates_async(
+    pagination: PaginationDep,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+) -> Sequence[RowMapping] | Response:
+    return await fetch_all(
+        db,
+        schedules_query(pagination, current_user),
+        "You do not have scheduled workouts",
+        response,
+        pagination,
+        schedule_rows,
+    )
+
+
+@router.get("/workout_log/", response_model=List[WorkoutLogResponse])
+async def get_logs_async(
+    pagination: PaginationDep,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+    search: Optional[str] = Query("", alias="name"),
+    threshold: float = Query(default=DEFAULT_THRESHOLD, gt=0, le=1),
+) -> Sequence[RowMapping] | Response:
+    if search and threshold != DEFAULT_THRESHOLD:
+        await db.execute(threshold_statement(threshold))
+    return await fetch_all(
+        db,
+        logs_query(pagination, current_user, search),
+        "Logs are not found",
+        response,
+        pagination,
+        log_rows,
+    )
+
+
+@router.get(
+    "/workout_items/", response_model=List[WorkoutItemsResponse]
+)
+async def get_items_async(
+    pagination: PaginationDep,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+) -> Sequence[RowMapping] | Response:
+    return await fetch_all(
+        db,
+        items_query(pagination, current_user),
+        "Items are not found",
+        response,
+        pagination,
+        item_rows,
+    )
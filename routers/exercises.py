@@ -1,8 +1,8 @@
 from typing import Annotated, List, Optional, Sequence
-from fastapi import Depends, HTTPException, Query, Response
-from sqlalchemy import RowMapping, select
+from fastapi import Depends, HTTPException, Query, Request, Response
+from sqlalchemy import RowMapping, Select, select
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from schemas.models import Exercise, ExerciseCategory
 from schemas.schemas import (
     ExerciseCreateResponse,
@@ -13,45 +13,82 @@ from schemas.schemas import (
 )
 from fastapi import APIRouter
 
+from utility.catalog import CATALOG_TABLES, catalog
+from utility.etag import not_modified, versions_query
 from utility.oauth2 import get_current_user, get_optional_user
+from utility.ownership import delete_owned, update_owned
+from utility.pagination import paginate, set_next_cursor
+from utility.serialization import RowSerializer, render_rows
+from utility.search import (
+    DEFAULT_THRESHOLD,
+    fuzzy_match,
+    threshold_statement,
+)
 
 router = APIRouter(prefix="/exercise", tags=["exercises"])
 
 PaginationDep = Annotated[PaginationParams, Depends(PaginationParams)]
+exercise_rows = RowSerializer(ExerciseResponse)
+EXERCISE_TABLES = CATALOG_TABLES
 
 
-@router.get("/", response_model=List[ExerciseResponse])
-def get_all_exercises_for_user(
-    pagination: PaginationDep,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_optional_user),
-    search: Optional[str] = Query(default="", alias="name"),
-):
+def exercises_query(
+    pagination: PaginationParams,
+    current_user,
+    search: Optional[str],
+) -> Select:
     query = select(
         ExerciseCategory.name.label("category"),
         Exercise.name.label("title"),
         Exercise.description,
     ).join(ExerciseCategory.exercises)
     if not current_user:
-        query = query.where(
-            Exercise.name.contains(search),
-            (Exercise.is_global.is_(True)),
-        )
+        query = query.where(Exercise.is_global.is_(True))
     elif current_user:
         query = query.where(
-            Exercise.name.contains(search),
             (Exercise.is_global.is_(True))
             | (Exercise.owner_id == current_user.id),
         )
-    query = query.limit(pagination.limit).offset(pagination.offset)
-    exercises: Sequence[RowMapping] = (
-        db.execute(query).mappings().all()
-    )
+    if search:
+        condition, similarity = fuzzy_match(Exercise.name, search)
+        return paginate(
+            query.where(condition),
+            [similarity, Exercise.id],
+            pagination,
+            descending=True,
+        )
+    return paginate(query, [Exercise.id], pagination)
+
+
+@router.get("/", response_model=List[ExerciseResponse])
+def get_all_exercises_for_user(
+    pagination: PaginationDep,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_optional_user),
+    search: Optional[str] = Query(default="", alias="name"),
+    threshold: float = Query(default=DEFAULT_THRESHOLD, gt=0, le=1),
+):
+    versions = db.execute(versions_query(EXERCISE_TABLES)).all()
+    cached = not_modified(request, response, versions, current_user)
+    if cached:
+        return cached
+    if not current_user:
+        exercises: Sequence = catalog.get(db, versions).list(
+            pagination, search, threshold
+        )
+    else:
+        if search and threshold != DEFAULT_THRESHOLD:
+            db.execute(threshold_statement(threshold))
+        query = exercises_query(pagination, current_user, search)
+        exercises = db.execute(query).mappings().all()
     if not exercises:
         raise HTTPException(
             status_code=404, detail="Exercises are not found"
         )
-    return exercises
+    set_next_cursor(response, exercises, pagination)
+    return render_rows(exercise_rows, exercises, response)
 
 
 @router.get(
@@ -60,26 +97,32 @@ def get_all_exercises_for_user(
 )
 def get_exercise_by_id(
     id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_optional_user),
 ):
-    query = (
-        select(
-            ExerciseCategory.name.label("category"),
-            Exercise.name.label("title"),
-            Exercise.description,
-        )
-        .join(ExerciseCategory.exercises)
-        .where(Exercise.id == id)
-    )
-    if current_user:
-        query = query.where(
-            Exercise.is_global.is_(True)
-            | (Exercise.owner_id == current_user.id)
+    versions = db.execute(versions_query(EXERCISE_TABLES)).all()
+    cached = not_modified(request, response, versions, current_user)
+    if cached:
+        return cached
+    if not current_user:
+        exercises: Sequence = catalog.get(db, versions).get(id)
+    else:
+        query = (
+            select(
+                ExerciseCategory.name.label("category"),
+                Exercise.name.label("title"),
+                Exercise.description,
+            )
+            .join(ExerciseCategory.exercises)
+            .where(
+                Exercise.id == id,
+                Exercise.is_global.is_(True)
+                | (Exercise.owner_id == current_user.id),
+            )
         )
-    exercises: Sequence[RowMapping] = (
-        db.execute(query).mappings().all()
-    )
+        exercises = db.execute(query).mappings().all()
     if not exercises:
         raise HTTPException(
             status_code=404, detail="Exercise is not found"
@@ -122,7 +165,7 @@ def create_exercise(
         raise HTTPException(
             status_code=422, detail="wrong credentials"
         )
-
+    catalog.invalidate()
     return new_exercise
 
 
@@ -132,23 +175,15 @@ def delete_exercise(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    delete_exercise: Exercise | None = db.execute(
-        select(Exercise).where(Exercise.id == id)
-    ).scalar_one_or_none()
-    if not delete_exercise:
-        raise HTTPException(
-            status_code=404, detail="Exercise not found"
-        )
-
-    if delete_exercise.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    try:
-        db.delete(delete_exercise)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
+    delete_owned(
+        db,
+        Exercise,
+        Exercise.id == id,
+        Exercise.owner_id == current_user.id,
+        not_found="Exercise not found",
+        forbidden="Not authorized",
+    )
+    catalog.invalidate()
 
 
 @router.put("/{id}", status_code=205)
@@ -158,20 +193,18 @@ def update_exercise(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    update_exercise: Exercise | None = db.execute(
-        select(Exercise).where(Exercise.id == id)
-    ).scalar_one_or_none()
-
-    if not update_exercise:
-        raise HTTPException(
-            status_code=404, detail="Exercise not found"
-        )
-    if update_exercise.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Unathorized")
-
     update_data = exercise.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(update_exercise, field, value)
-    db.commit()
-    db.refresh(update_exercise)
+    # the schema calls the name a title
+    if "title" in update_data:
+        update_data["name"] = update_data.pop("title")
+    update_owned(
+        db,
+        Exercise,
+        Exercise.id == id,
+        Exercise.owner_id == current_user.id,
+        update_data,
+        not_found="Exercise not found",
+        forbidden="Unathorized",
+    )
+    catalog.invalidate()
     return Response(status_code=205)
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Iterator, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from database import read_session
+from schemas.models import Exercise, WorkoutLog, WorkoutLogItems
+from schemas.schemas import ExportRow
+from utility.oauth2 import get_current_user
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+# rows fetched from the server side cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_query(
+    current_user, started_after: Optional[datetime]
+) -> Select:
+    query = (
+        select(
+            WorkoutLog.id.label("log_id"),
+            WorkoutLog.plan_id,
+            WorkoutLog.started_at,
+            WorkoutLog.ended_at,
+            WorkoutLog.notes.label("log_notes"),
+            WorkoutLogItems.id.label("item_id"),
+            WorkoutLogItems.exercise_id,
+            Exercise.name.label("exercise_name"),
+            WorkoutLogItems.set_number,
+            WorkoutLogItems.reps,
+            WorkoutLogItems.weight,
+            WorkoutLogItems.notes.label("item_notes"),
+        )
+        .outerjoin(WorkoutLog.items)
+        .outerjoin(WorkoutLogItems.exer)
+        .where(WorkoutLog.user_id == current_user.id)
+        .order_by(
+            WorkoutLog.started_at,
+            WorkoutLog.id,
+            WorkoutLogItems.set_number,
+            WorkoutLogItems.id,
+        )
+    )
+    # filters by when the session started, not by when it was changed
+    if started_after:
+        query = query.where(WorkoutLog.started_at > started_after)
+    return query
+
+
+# the session lives inside the generator, request scoped sessions are
+# closed before the body is streamed
+def stream_rows(request: Request, query: Select) -> Iterator[bytes]:
+    with read_session(request) as db:
+        result = db.execute(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for rows in result.mappings().partitions():
+            yield b"".join(
+                ExportRow.model_validate(row)
+                .model_dump_json()
+                .encode()
+                + b"\n"
+                for row in rows
+            )
+
+
+@router.get("/")
+def export_history(
+    request: Request,
+    current_user=Depends(get_current_user),
+    started_after: Optional[datetime] = Query(default=None),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(
+            request, export_query(current_user, started_after)
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+
+from utility.catalog import catalog
+from utility.hash import hash_pool
+from utility.pool_metrics import pool_metrics
+from utility.rollups import rollups
+from utility.sql_metrics import route_stats
+from utility.user_cache import user_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/user_cache")
+def get_user_cache_metrics() -> dict:
+    return user_cache.stats()
+
+
+@router.get("/hash_pool")
+def get_hash_pool_metrics() -> dict:
+    return hash_pool.stats()
+
+
+@router.get("/pool")
+def get_pool_metrics() -> list[dict]:
+    return [metrics.stats() for metrics in pool_metrics.values()]
+
+
+@router.get("/sql")
+def get_sql_metrics() -> dict:
+    return route_stats.stats()
+
+
+@router.get("/catalog")
+def get_catalog_metrics() -> dict:
+    return catalog.stats()
+
+
+@router.get("/rollups")
+def get_rollup_metrics() -> dict:
+    return rollups.stats()
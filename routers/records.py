@@ -0,0 +1,41 @@
+from typing import List, Sequence
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import RowMapping, select
+from sqlalchemy.orm import Session
+from database import get_read_db
+from schemas.models import Exercise, PersonalRecord
+from schemas.schemas import PersonalRecordResponse
+from utility.oauth2 import get_current_user
+from utility.serialization import RowSerializer, render_rows
+
+router = APIRouter(prefix="/records", tags=["Records"])
+
+record_rows = RowSerializer(PersonalRecordResponse)
+
+
+@router.get("/", response_model=List[PersonalRecordResponse])
+def get_records(
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+) -> Sequence[RowMapping] | Response:
+    records: Sequence[RowMapping] = (
+        db.execute(
+            select(
+                PersonalRecord.exercise_id,
+                Exercise.name.label("exercise"),
+                PersonalRecord.max_weight,
+                PersonalRecord.max_weight_reps,
+                PersonalRecord.max_reps,
+                PersonalRecord.epley_1rm,
+                PersonalRecord.brzycki_1rm,
+                PersonalRecord.updated_at,
+            )
+            .join(Exercise, Exercise.id == PersonalRecord.exercise_id)
+            .where(PersonalRecord.user_id == current_user.id)
+            .order_by(Exercise.name, PersonalRecord.exercise_id)
+        )
+        .mappings()
+        .all()
+    )
+    return render_rows(record_rows, records, response)
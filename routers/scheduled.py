@@ -1,9 +1,12 @@
 from typing import Annotated, List, Sequence
 from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy import select, RowMapping
+from sqlalchemy import Select, select, RowMapping
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from utility.oauth2 import get_current_user
+from utility.ownership import delete_owned, update_owned
+from utility.pagination import paginate, set_next_cursor
+from utility.serialization import RowSerializer, render_rows
 from schemas.schemas import (
     PaginationParams,
     ScheduleUpdate,
@@ -15,6 +18,7 @@ from schemas.models import ScheduledWorkout, WorkoutPlans
 
 router = APIRouter(prefix="/scheduled", tags=["Scheduled"])
 PaginationDep = Annotated[PaginationParams, Depends(PaginationParams)]
+schedule_rows = RowSerializer(ScheduledWorkoutGetResponse)
 
 
 @router.post("/create", response_model=ScheduledWorkoutResponse)
@@ -38,26 +42,36 @@ def schedule_workout(
     return new_scheduled
 
 
+def schedules_query(
+    pagination: PaginationParams, current_user
+) -> Select:
+    query = (
+        select(
+            ScheduledWorkout.title,
+            ScheduledWorkout.duration_minutes,
+            ScheduledWorkout.scheduled_at,
+            ScheduledWorkout.status,
+            WorkoutPlans.title.label("plan"),
+        )
+        .join(ScheduledWorkout.plan)
+        .where(ScheduledWorkout.user_id == current_user.id)
+    )
+    return paginate(
+        query,
+        [ScheduledWorkout.scheduled_at, ScheduledWorkout.id],
+        pagination,
+    )
+
+
 @router.get("/", response_model=List[ScheduledWorkoutGetResponse])
 def get_all_dates(
     pagination: PaginationDep,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
-) -> Sequence[RowMapping]:
+) -> Sequence[RowMapping] | Response:
     scheduled: Sequence[RowMapping] = (
-        db.execute(
-            select(
-                ScheduledWorkout.title,
-                ScheduledWorkout.duration_minutes,
-                ScheduledWorkout.scheduled_at,
-                ScheduledWorkout.status,
-                WorkoutPlans.title.label("plan"),
-            )
-            .join(ScheduledWorkout.plan)
-            .where(ScheduledWorkout.user_id == current_user.id)
-            .limit(pagination.limit)
-            .offset(pagination.offset)
-        )
+        db.execute(schedules_query(pagination, current_user))
         .mappings()
         .all()
     )
@@ -66,15 +80,15 @@ def get_all_dates(
             status_code=404,
             detail="You do not have scheduled workouts",
         )
-
-    return scheduled
+    set_next_cursor(response, scheduled, pagination)
+    return render_rows(schedule_rows, scheduled, response)
 
 
 @router.get("/{id}", response_model=List[ScheduledWorkoutGetResponse])
 def get_date_by_id(
     id: int,
     pagination: PaginationDep,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> Sequence[RowMapping]:
     scheduled: Sequence[RowMapping] = (
@@ -113,25 +127,15 @@ def update_schedule(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> Response:
-    update_schedule: RowMapping = db.execute(
-        select(ScheduledWorkout).where(
-            ScheduledWorkout.id == id,
-        )
-    ).scalar_one_or_none()
-    if not update_schedule:
-        raise HTTPException(
-            status_code=404, detail="Nothing scheduld with this id"
-        )
-    if update_schedule.user_id != current_user.id:
-        raise HTTPException(status_code=403)
-    new_schedule: dict = schedule.model_dump(exclude_unset=True)
-    for k, v in new_schedule.items():
-        setattr(update_schedule, k, v)
-    try:
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
+    update_owned(
+        db,
+        ScheduledWorkout,
+        ScheduledWorkout.id == id,
+        ScheduledWorkout.user_id == current_user.id,
+        schedule.model_dump(exclude_unset=True),
+        not_found="Nothing scheduld with this id",
+        forbidden="Forbidden",
+    )
     return Response(status_code=205)
 
 
@@ -141,23 +145,12 @@ def delete_scheduled(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> Response:
-    schedule_to_delete: RowMapping = db.execute(
-        select(ScheduledWorkout).where(
-            ScheduledWorkout.id == id,
-        )
-    ).scalar_one_or_none()
-    if not schedule_to_delete:
-        raise HTTPException(
-            status_code=404, detail="Nothing scheduld with this id"
-        )
-    if schedule_to_delete.user_id != current_user.id:
-        raise HTTPException(status_code=403)
-
-    try:
-        db.delete(schedule_to_delete)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-
+    delete_owned(
+        db,
+        ScheduledWorkout,
+        ScheduledWorkout.id == id,
+        ScheduledWorkout.user_id == current_user.id,
+        not_found="Nothing scheduld with this id",
+        forbidden="Forbidden",
+    )
     return Response(status_code=204)
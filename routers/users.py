@@ -1,10 +1,12 @@
 from typing import Any
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select  # noqa: F401
 from database import get_db
 from schemas.models import User
 from schemas.schemas import (
     LoginRequest,
+    RefreshRequest,
     Token,
     UserCreate,
     UserResponse,
@@ -13,32 +15,47 @@ from sqlalchemy.orm import Session
 from utility.oauth2 import (
     create_access_token,
     get_current_user,
-)  # noqa: F401
-from utility.hash import hash_password, verify_password  # noqa: F401
+    revoke_tokens,
+    token_claims,
+)
+from utility.hash import (
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+from utility.refresh_token import (
+    issue_refresh_token,
+    rotate_refresh_token,
+)
 from fastapi import APIRouter
 
-
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.post("/signin", status_code=201, response_model=UserResponse)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    hashed_password: str = hash_password(user.password)
+async def create_user(
+    user: UserCreate, db: Session = Depends(get_db)
+):
+    hashed_password: str = await hash_password_async(user.password)
     user.password = hashed_password
     new_user = User(**user.model_dump())
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+
+    def save() -> User:
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user
+
+    return await run_in_threadpool(save)
 
 
 @router.post("/login", status_code=200, response_model=Token)
-def login_user(
+async def login_user(
     user: LoginRequest,
     db: Session = Depends(get_db),
 ) -> dict[str, str]:
-    user_data: User | None = db.scalar(
-        select(User).where(User.email == user.email)
+    user_data: User | None = await run_in_threadpool(
+        db.scalar, select(User).where(User.email == user.email)
     )
     if not user_data:
         raise HTTPException(
@@ -46,16 +63,76 @@ def login_user(
             detail="Unknown user",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if verify_password(user.password, user_data.password) is False:
+    if (
+        await verify_password_async(user.password, user_data.password)
+        is False
+    ):
         raise HTTPException(
             status_code=403,
             detail="Unknown user",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token: str = create_access_token(
-        data={"user_id": user_data.id}
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    if not user_data.is_active:
+        raise HTTPException(
+            status_code=403,
+            detail="User is deactivated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    claims: dict = token_claims(user_data)
+    if needs_rehash(user_data.password):
+        user_data.password = await hash_password_async(user.password)
+        try:
+            await run_in_threadpool(db.commit)
+        except Exception:
+            # old hash still verifies, retry on the next login
+            await run_in_threadpool(db.rollback)
+
+    def save_refresh_token() -> str:
+        refresh_token: str = issue_refresh_token(
+            db, claims["user_id"]
+        )
+        db.commit()
+        return refresh_token
+
+    refresh_token: str = await run_in_threadpool(save_refresh_token)
+    access_token: str = create_access_token(data=claims)
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/refresh", status_code=200, response_model=Token)
+def refresh_access_token(
+    data: RefreshRequest,
+    db: Session = Depends(get_db),
+) -> dict[str, str]:
+    user, refresh_token = rotate_refresh_token(db, data.refresh_token)
+    access_token: str = create_access_token(data=token_claims(user))
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/logout", status_code=204)
+def logout_user(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> Response:
+    revoke_tokens(db, current_user.id)
+    return Response(status_code=204)
+
+
+@router.post("/deactivate", status_code=204)
+def deactivate_user(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> Response:
+    revoke_tokens(db, current_user.id, is_active=False)
+    return Response(status_code=204)
 
 
 # test function for jwt
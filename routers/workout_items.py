@@ -1,40 +1,56 @@
 from fastapi import HTTPException, APIRouter, Depends, Response
-from sqlalchemy import select, RowMapping
+from sqlalchemy import Select, delete, insert, select, RowMapping
 from sqlalchemy.orm import Session
-from typing import List, Sequence
-from database import get_db
+from typing import Annotated, List, Sequence
+from database import get_db, get_read_db
 from schemas.models import Exercise, WorkoutItems, WorkoutPlans
 from schemas.schemas import (
+    PaginationParams,
     WorkoutItemCreate,
     WorkoutItemsCreateResponse,
     WorkoutItemsResponse,
     WorkoutItemsUpdate,
 )
+from utility.exercises import require_exercises
 from utility.oauth2 import get_current_user
+from utility.ownership import delete_owned, update_owned
+from utility.pagination import paginate, set_next_cursor
+from utility.serialization import RowSerializer, render_rows
 
 router = APIRouter(prefix="/workout_items", tags=["Workouts"])
+PaginationDep = Annotated[PaginationParams, Depends(PaginationParams)]
+item_rows = RowSerializer(WorkoutItemsResponse)
+
+
+def items_query(pagination: PaginationParams, current_user) -> Select:
+    query = (
+        select(
+            WorkoutItems.id,
+            WorkoutItems.plan_id,
+            Exercise.name.label("exercise_name"),
+            Exercise.description.label("exercise_description"),
+            WorkoutPlans.title.label("exercise_purpose"),
+            WorkoutItems.sets,
+            WorkoutItems.reps,
+        )
+        .join(WorkoutItems.exercise)
+        .join(WorkoutItems.plan)
+        .where(WorkoutPlans.user_id == current_user.id)
+    )
+    return paginate(
+        query, [WorkoutItems.plan_id, WorkoutItems.id], pagination
+    )
 
 
 @router.get("/", response_model=List[WorkoutItemsResponse])
 def get_items(
-    db: Session = Depends(get_db),
+    pagination: PaginationDep,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
-) -> Sequence[RowMapping]:
+) -> Sequence[RowMapping] | Response:
     items: Sequence[RowMapping] = (
-        db.execute(
-            select(
-                WorkoutItems.id,
-                WorkoutItems.plan_id,
-                Exercise.name.label("exercise_name"),
-                Exercise.description.label("exercise_description"),
-                WorkoutPlans.title.label("exercise_purpose"),
-                WorkoutItems.sets,
-                WorkoutItems.reps,
-            )
-            .join(WorkoutItems.exercise)
-            .join(WorkoutItems.plan)
-            .where(WorkoutPlans.user_id == current_user.id)
-        )
+        db.execute(items_query(pagination, current_user))
         .mappings()
         .all()
     )
@@ -42,14 +58,14 @@ def get_items(
         raise HTTPException(
             status_code=404, detail="Items are not found"
         )
-
-    return items
+    set_next_cursor(response, items, pagination)
+    return render_rows(item_rows, items, response)
 
 
 @router.get("/{id}", response_model=List[WorkoutItemsResponse])
 def get_item_by_id(
     id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ) -> Sequence[RowMapping]:
     items: Sequence[RowMapping] = (
@@ -107,32 +123,33 @@ def create_workout_item(
             status_code=404, detail="Plan doesn't exists"
         )
 
-    get_exercises: Sequence[RowMapping] | None = (
-        db.execute(
-            select(Exercise.id).where(
-                Exercise.id.in_(item.exercise_id)
-            )
-        )
-        .mappings()
-        .all()
-    )
-    if not get_exercises:
-        raise HTTPException(
-            status_code=404, detail="Exercises are not found"
-        )
-    new_items = []
+    require_exercises(db, item.exercise_id)
     try:
-        for exercise_id in item.exercise_id:
-            new_item = WorkoutItems(
-                plan_id=item.plan_id,
-                exercise_id=exercise_id,
-                sets=item.sets,
-                reps=item.reps,
-                weight=item.weight,
-                rest_seconds=item.rest_seconds,
+        new_items: Sequence[RowMapping] = (
+            db.execute(
+                insert(WorkoutItems)
+                .values(
+                    [
+                        {
+                            "plan_id": item.plan_id,
+                            "exercise_id": exercise_id,
+                            "sets": item.sets,
+                            "reps": item.reps,
+                            "weight": item.weight,
+                            "rest_seconds": item.rest_seconds,
+                        }
+                        for exercise_id in item.exercise_id
+                    ]
+                )
+                .returning(
+                    WorkoutItems.id,
+                    WorkoutItems.plan_id,
+                    WorkoutItems.exercise_id,
+                )
             )
-            db.add(new_item)
-            new_items.append(new_item)
+            .mappings()
+            .all()
+        )
         db.commit()
     except Exception:
         db.rollback()
@@ -141,6 +158,12 @@ def create_workout_item(
     return new_items
 
 
+def owned_plans(current_user) -> Select:
+    return select(WorkoutPlans.id).where(
+        WorkoutPlans.user_id == current_user.id
+    )
+
+
 @router.put("/{pid}/{id}", status_code=205)
 def edit_plan(
     pid: int,
@@ -149,45 +172,15 @@ def edit_plan(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> Response:
-    get_plan: WorkoutPlans | None = db.execute(
-        select(WorkoutPlans).where(WorkoutPlans.id == pid)
-    ).scalar_one_or_none()
-    if not get_plan:
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    if (
-        get_plan.user_id != current_user.id
-        and get_plan.is_public is True
-    ):
-        raise HTTPException(
-            status_code=403, detail="You cannot change this plan"
-        )
-
-    plan_obj: WorkoutItems | None = db.execute(
-        select(WorkoutItems).where(
-            WorkoutItems.id == id,
-            WorkoutItems.plan_id == pid,
-        )
-    ).scalar_one_or_none()
-
-    if not plan_obj:
-        raise HTTPException(status_code=404, detail="Plan Not found")
-
-    item: WorkoutItems | None = db.execute(
-        select(WorkoutItems).where(WorkoutItems.id == id)
-    ).scalar_one_or_none()
-    update_plan = plan_data.model_dump(exclude_unset=True)
-
-    try:
-        for k, v in update_plan.items():
-            setattr(item, k, v)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.refresh(item)
-
+    update_owned(
+        db,
+        WorkoutItems,
+        (WorkoutItems.id == id) & (WorkoutItems.plan_id == pid),
+        WorkoutItems.plan_id.in_(owned_plans(current_user)),
+        plan_data.model_dump(exclude_unset=True),
+        not_found="Plan Not found",
+        forbidden="You cannot change this plan",
+    )
     return Response(status_code=205)
 
 
@@ -198,46 +191,14 @@ def delete_exercise(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> Response:
-    get_plan: WorkoutPlans | None = db.execute(
-        select(WorkoutPlans).where(WorkoutPlans.id == pid)
-    ).scalar_one_or_none()
-    if not get_plan:
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    if (
-        get_plan.user_id != current_user.id
-        and get_plan.is_public is True
-    ):
-        raise HTTPException(
-            status_code=403, detail="You cannot change this plan"
-        )
-
-    plan_obj: WorkoutItems | None = db.execute(
-        select(WorkoutItems).where(
-            WorkoutItems.id == id,
-            WorkoutItems.plan_id == pid,
-        )
-    ).scalar_one_or_none()
-
-    if not plan_obj:
-        raise HTTPException(status_code=404, detail="Plan Not found")
-
-    item: WorkoutItems | None = db.execute(
-        select(WorkoutItems).where(WorkoutItems.id == id)
-    ).scalar_one_or_none()
-
-    if not item:
-        raise HTTPException(
-            status_code=404, detail="Plan doesn't exist"
-        )
-
-    try:
-        db.delete(item)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-
+    delete_owned(
+        db,
+        WorkoutItems,
+        (WorkoutItems.id == id) & (WorkoutItems.plan_id == pid),
+        WorkoutItems.plan_id.in_(owned_plans(current_user)),
+        not_found="Plan Not found",
+        forbidden="You cannot change this plan",
+    )
     return Response(status_code=204)
 
 
@@ -247,26 +208,37 @@ def delete_plan(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    get_plan = db.execute(
-        select(WorkoutPlans).where(WorkoutPlans.id == pid)
-    ).scalar_one_or_none()
-
-    if not get_plan:
-        raise HTTPException(
-            status_code=404, detail="Plan doesn't exist"
-        )
-
-    if get_plan.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="You can not change this plan"
-        )
     try:
-        db.query(WorkoutItems).filter(
-            WorkoutItems.plan_id == pid
-        ).delete(synchronize_session=False)
+        deleted = db.execute(
+            delete(WorkoutItems)
+            .where(
+                WorkoutItems.plan_id == pid,
+                WorkoutItems.plan_id.in_(owned_plans(current_user)),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
         db.commit()
     except Exception:
         db.rollback()
         raise
+    if not deleted:
+        # nothing deleted, either an empty plan of the user or a miss
+        plan: RowMapping | None = (
+            db.execute(
+                select(WorkoutPlans.user_id).where(
+                    WorkoutPlans.id == pid
+                )
+            )
+            .mappings()
+            .first()
+        )
+        if not plan:
+            raise HTTPException(
+                status_code=404, detail="Plan doesn't exist"
+            )
+        if plan.user_id != current_user.id:
+            raise HTTPException(
+                status_code=403, detail="You can not change this plan"
+            )
 
     return Response(status_code=204)
@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional, Annotated, Sequence
-from sqlalchemy import RowMapping, select
+from sqlalchemy import RowMapping, Select, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from utility.oauth2 import get_current_user
+from utility.ownership import delete_owned, update_owned
+from utility.pagination import paginate, set_next_cursor
+from utility.serialization import RowSerializer, render_rows
+from utility.search import (
+    DEFAULT_THRESHOLD,
+    fuzzy_match,
+    threshold_statement,
+)
 from schemas.models import ScheduledWorkout, WorkoutLog, WorkoutPlans
 from schemas.schemas import (
     PaginationParams,
@@ -15,6 +24,7 @@ from schemas.schemas import (
 
 router = APIRouter(prefix="/workout_log", tags=["Scheduled"])
 PaginationDep = Annotated[PaginationParams, Depends(PaginationParams)]
+log_rows = RowSerializer(WorkoutLogResponse)
 
 
 @router.post("/create_log", response_model=WorkoutLogCreateResponse)
@@ -64,33 +74,54 @@ def create_log(
     return new_log
 
 
+def logs_query(
+    pagination: PaginationParams, current_user, search: Optional[str]
+) -> Select:
+    query = (
+        select(
+            WorkoutPlans.title.label("plan_name"),
+            ScheduledWorkout.title.label("scheduled_title"),
+            ScheduledWorkout.status,
+            ScheduledWorkout.scheduled_at.label("scheduled"),
+            WorkoutLog.started_at,
+            WorkoutLog.ended_at,
+            WorkoutLog.notes,
+        )
+        .join(WorkoutLog.plan)
+        .join(WorkoutLog.scheduled_workout)
+        .where(WorkoutLog.user_id == current_user.id)
+    )
+    if search:
+        condition, similarity = fuzzy_match(
+            WorkoutPlans.title, search
+        )
+        return paginate(
+            query.where(condition),
+            [similarity, WorkoutLog.id],
+            pagination,
+            descending=True,
+        )
+    return paginate(
+        query,
+        [WorkoutLog.started_at, WorkoutLog.id],
+        pagination,
+        descending=True,
+    )
+
+
 @router.get("/", response_model=List[WorkoutLogResponse])
 def get_logs(
     pagination: PaginationDep,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     search: Optional[str] = Query("", alias="name"),
+    threshold: float = Query(default=DEFAULT_THRESHOLD, gt=0, le=1),
 ):
+    if search and threshold != DEFAULT_THRESHOLD:
+        db.execute(threshold_statement(threshold))
     logs: Sequence[RowMapping] | None = (
-        db.execute(
-            select(
-                WorkoutPlans.title.label("plan_name"),
-                ScheduledWorkout.title.label("scheduled_title"),
-                ScheduledWorkout.status,
-                ScheduledWorkout.scheduled_at.label("scheduled"),
-                WorkoutLog.started_at,
-                WorkoutLog.ended_at,
-                WorkoutLog.notes,
-            )
-            .join(WorkoutLog.plan)
-            .join(WorkoutLog.scheduled_workout)
-            .where(
-                WorkoutLog.user_id == current_user.id,
-                WorkoutPlans.title.contains(search),
-            )
-            .limit(pagination.limit)
-            .offset(pagination.offset)
-        )
+        db.execute(logs_query(pagination, current_user, search))
         .mappings()
         .all()
     )
@@ -98,13 +129,14 @@ def get_logs(
         raise HTTPException(
             status_code=404, detail="Logs are not found"
         )
-    return logs
+    set_next_cursor(response, logs, pagination)
+    return render_rows(log_rows, logs, response)
 
 
 @router.get("/{id}", response_model=List[WorkoutLogResponse])
 def get_logs_by_id(
     id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
     logs: Sequence[RowMapping] | None = (
@@ -141,24 +173,14 @@ def delete_log(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    delete_log: RowMapping | None = db.execute(
-        select(WorkoutLog).where(WorkoutLog.id == id)
-    ).scalar_one_or_none()
-
-    if not delete_log:
-        raise HTTPException(
-            status_code=404, detail="Log doesn't exists"
-        )
-
-    if delete_log.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Unathorized")
-
-    try:
-        db.delete(delete_log)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=409, detail=f"{Exception}")
+    delete_owned(
+        db,
+        WorkoutLog,
+        WorkoutLog.id == id,
+        WorkoutLog.user_id == current_user.id,
+        not_found="Log doesn't exists",
+        forbidden="Unathorized",
+    )
     return Response(status_code=204)
 
 
@@ -169,25 +191,16 @@ def update_log(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    update_log: RowMapping | None = db.execute(
-        select(WorkoutLog).where(WorkoutLog.id == id)
-    ).scalar_one_or_none()
-
-    if not update_log:
-        raise HTTPException(
-            status_code=404, detail="Log doesn't exist"
-        )
-
-    if update_log.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Unauthorized")
-
-    new_log: dict = new.model_dump(exclude_unset=True)
     try:
-        for k, v in new_log.items():
-            setattr(update_log, k, v)
-        db.commit()
-        db.refresh(update_log)
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=409, detail=f"{Exception}")
+        update_owned(
+            db,
+            WorkoutLog,
+            WorkoutLog.id == id,
+            WorkoutLog.user_id == current_user.id,
+            new.model_dump(exclude_unset=True),
+            not_found="Log doesn't exist",
+            forbidden="Unauthorized",
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Conflict")
     return Response(status_code=205)
@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
 from typing import Sequence
-from sqlalchemy import RowMapping, select
+from sqlalchemy import RowMapping, Select, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from schemas.schemas import (
     WorkoutLogItemsRequest,
     WorkoutLogItemsUpdate,
 )
+from utility.bulk_import import (
+    import_log_items,
+    parse_rows,
+    spool_body,
+    spooled_lines,
+)
+from utility.exercises import require_exercises
 from utility.oauth2 import get_current_user
+from utility.ownership import delete_owned, update_owned
 from schemas.models import WorkoutLog, WorkoutLogItems
 
 router = APIRouter(
@@ -31,35 +47,90 @@ def create_log_items(
     if not workout_log:
         raise HTTPException(status_code=404, detail="Log not found")
 
-    created_items: list = []
-
+    require_exercises(db, (item.exercise_id for item in data.items))
     try:
-        for item in data.items:
-            log_item = WorkoutLogItems(
-                log_id=data.log_id,
-                exercise_id=item.exercise_id,
-                workout_item_id=item.workout_item_id,
-                set_number=item.set_number,
-                reps=item.reps,
-                weight=item.weight,
-                notes=item.notes,
+        created_items: Sequence[int] = (
+            db.execute(
+                insert(WorkoutLogItems)
+                .values(
+                    [
+                        {"log_id": data.log_id, **item.model_dump()}
+                        for item in data.items
+                    ]
+                )
+                .returning(WorkoutLogItems.id)
             )
-            db.add(log_item)
-            created_items.append(log_item)
+            .scalars()
+            .all()
+        )
         db.commit()
-    except Exception:
+    except IntegrityError:
         db.rollback()
-        raise HTTPException(status_code=422)
+        raise HTTPException(
+            status_code=422, detail="Invalid log items"
+        )
     return {
         "log_id": data.log_id,
         "items_created": len(created_items),
     }
 
 
+# bulk variant of create_log_item for large CSV or NDJSON uploads
+@router.post("/{log_id}/import")
+async def import_log_items_file(
+    log_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    content_type: str = request.headers.get("Content-Type", "")
+    if content_type.startswith("text/csv"):
+        ndjson = False
+    elif content_type.startswith(
+        ("application/x-ndjson", "application/jsonl")
+    ):
+        ndjson = True
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload text/csv or application/x-ndjson",
+        )
+
+    def owns_log() -> bool:
+        try:
+            return (
+                db.scalar(
+                    select(WorkoutLog.id).where(
+                        WorkoutLog.id == log_id,
+                        WorkoutLog.user_id == current_user.id,
+                    )
+                )
+                is not None
+            )
+        finally:
+            # returns the connection to the pool while the body uploads
+            db.rollback()
+
+    if not await run_in_threadpool(owns_log):
+        raise HTTPException(status_code=404, detail="Log not found")
+    spool = await spool_body(request.stream())
+
+    def run_import() -> dict:
+        with spool:
+            rows = parse_rows(spooled_lines(spool), ndjson)
+            try:
+                return import_log_items(db, log_id, rows)
+            except Exception:
+                db.rollback()
+                raise
+
+    return await run_in_threadpool(run_import)
+
+
 @router.get("/{log_id}/all")
 def get_log_items(
     log_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
     log: Sequence[WorkoutLogItems] = (
@@ -83,6 +154,12 @@ def get_log_items(
     return log
 
 
+def owned_logs(current_user) -> Select:
+    return select(WorkoutLog.id).where(
+        WorkoutLog.user_id == current_user.id
+    )
+
+
 @router.put("/{log_id}", status_code=205)
 def update_log_items(
     data: WorkoutLogItemsUpdate,
@@ -90,29 +167,17 @@ def update_log_items(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    log: Sequence[WorkoutLogItems] = db.execute(
-        select(WorkoutLogItems)
-        .join(WorkoutLogItems.log)
-        .where(
+    try:
+        update_owned(
+            db,
+            WorkoutLogItems,
             WorkoutLogItems.log_id == log_id,
-            WorkoutLog.user_id == current_user.id,
-        )
-    ).scalar_one_or_none()
-
-    if not log:
-        raise HTTPException(
-            status_code=404, detail="Log doesn't exist"
+            WorkoutLogItems.log_id.in_(owned_logs(current_user)),
+            data.model_dump(exclude_unset=True),
+            not_found="Log doesn't exist",
         )
-
-    update_log: dict = data.model_dump(exclude_unset=True)
-
-    try:
-        for k, v in update_log.items():
-            setattr(log, k, v)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=409, detail=f"{Exception}")
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Conflict")
     return Response(status_code=205)
 
 
@@ -122,23 +187,11 @@ def delete_log_items(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    log: Sequence[WorkoutLogItems] = db.execute(
-        select(WorkoutLogItems)
-        .join(WorkoutLogItems.log)
-        .where(
-            WorkoutLogItems.log_id == log_id,
-            WorkoutLog.user_id == current_user.id,
-        )
-    ).scalar_one_or_none()
-    if not log:
-        raise HTTPException(status_code=404, detail="Log not found")
-
-    try:
-        db.query(WorkoutLogItems).filter(
-            WorkoutLogItems.log_id == log_id
-        ).delete(synchronize_session=False)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=409, detail=f"{Exception}")
+    delete_owned(
+        db,
+        WorkoutLogItems,
+        WorkoutLogItems.log_id == log_id,
+        WorkoutLogItems.log_id.in_(owned_logs(current_user)),
+        not_found="Log not found",
+    )
     return Response(status_code=204)
@@ -1,75 +1,214 @@
-from fastapi import Depends, HTTPException, APIRouter, Response
-from sqlalchemy import select, RowMapping
+from fastapi import (
+    Depends,
+    HTTPException,
+    APIRouter,
+    Query,
+    Request,
+    Response,
+)
+from sqlalchemy import (
+    ColumnElement,
+    RowMapping,
+    Select,
+    select,
+)
 from sqlalchemy.orm import Session
 from typing import Annotated, List, Optional, Sequence
-from schemas.models import WorkoutPlans
+from schemas.models import (
+    Exercise,
+    ExerciseCategory,
+    WorkoutItems,
+    WorkoutPlans,
+)
 from schemas.schemas import (
     PaginationParams,
     PlanUpdate,
     WorkoutPlanCreate,
+    WorkoutPlanGeneralResponse,
     WorkoutPlanResponse,
 )
-from database import get_db
+from database import get_db, get_read_db
+from utility.etag import not_modified
 from utility.oauth2 import get_current_user, get_optional_user
+from utility.ownership import delete_owned, update_owned
+from utility.pagination import paginate, set_next_cursor
+from utility.serialization import RowSerializer, render_rows
 
 PaginationDep = Annotated[PaginationParams, Depends(PaginationParams)]
+plan_rows = RowSerializer(WorkoutPlanResponse)
+# plan ids accepted by one GET /workoutplans/full
+MAX_FULL_PLANS = 100
 
 router = APIRouter(prefix="/workoutplans", tags=["Workouts"])
 
 
-@router.get("/", response_model=List[WorkoutPlanResponse])
-def get_workout_plan(
-    pagination: PaginationDep,
-    db=Depends(get_db),
-    current_user=Depends(get_optional_user),
-) -> Sequence[RowMapping]:
+def visible_plans(current_user) -> ColumnElement[bool]:
+    if current_user:
+        return (WorkoutPlans.user_id == current_user.id) | (
+            WorkoutPlans.is_public.is_(True)
+        )
+    return WorkoutPlans.is_public.is_(True)
+
+
+def plan_versions(rows: Sequence[RowMapping]) -> list[tuple]:
+    """
+    Version of the plans a response shows for the ETag: their ids and
+    when each of them last changed. Writes to plans outside of the page
+    leave it as it is.
+    """
+    return [
+        (
+            "workout_plans",
+            f"{row['id']}:{row['updated_at'].timestamp()}",
+        )
+        for row in rows
+    ]
+
+
+def plans_query(pagination: PaginationParams, current_user) -> Select:
     query = select(
         WorkoutPlans.title.label("title"),
         WorkoutPlans.description.label("description"),
         WorkoutPlans.is_public.label("public"),
         WorkoutPlans.created_at.label("created_at"),
+        WorkoutPlans.id.label("id"),
+        WorkoutPlans.updated_at.label("updated_at"),
+    ).where(visible_plans(current_user))
+    return paginate(
+        query,
+        [WorkoutPlans.created_at, WorkoutPlans.id],
+        pagination,
+        descending=True,
     )
-    if not current_user:
-        query = query.where(WorkoutPlans.is_public.is_(True))
-    elif current_user:
-        query = query.where(
-            (WorkoutPlans.user_id == current_user.id)
-            | WorkoutPlans.is_public.is_(True)
-        )
-    query = query.limit(pagination.limit).offset(pagination.offset)
+
+
+@router.get("/", response_model=List[WorkoutPlanResponse])
+def get_workout_plan(
+    pagination: PaginationDep,
+    request: Request,
+    response: Response,
+    db=Depends(get_read_db),
+    current_user=Depends(get_optional_user),
+) -> Sequence[RowMapping] | Response:
+    query = plans_query(pagination, current_user)
     workout: Sequence[RowMapping] = db.execute(query).mappings().all()
     if not workout:
         raise HTTPException(
             status_code=404, detail="Workout plans doesn't exists"
         )
-    return workout
+    set_next_cursor(response, workout, pagination)
+    cached = not_modified(
+        request, response, plan_versions(workout), current_user
+    )
+    if cached:
+        return cached
+    return render_rows(plan_rows, workout, response)
+
+
+def load_full_plans(
+    db: Session, ids: Sequence[int], current_user
+) -> list[dict]:
+    """
+    Plans with their items and exercises in two statements, whatever
+    the number of plans: one for the plans, one joined projection for
+    all of their items
+    """
+    query = select(
+        WorkoutPlans.id,
+        WorkoutPlans.user_id,
+        WorkoutPlans.title,
+        WorkoutPlans.description,
+        WorkoutPlans.created_at,
+    ).where(WorkoutPlans.id.in_(ids), visible_plans(current_user))
+    plans = {
+        row["id"]: {**row, "exercises": []}
+        for row in db.execute(query.order_by(WorkoutPlans.id))
+        .mappings()
+        .all()
+    }
+    if not plans:
+        return []
+    items = db.execute(
+        select(
+            WorkoutItems.plan_id,
+            WorkoutItems.id,
+            WorkoutItems.sets,
+            WorkoutItems.reps,
+            WorkoutItems.weight,
+            WorkoutItems.rest_seconds,
+            ExerciseCategory.name.label("category"),
+            Exercise.name.label("title"),
+            Exercise.description,
+        )
+        .join(WorkoutItems.exercise)
+        .join(Exercise.category)
+        .where(WorkoutItems.plan_id.in_(plans))
+        .order_by(WorkoutItems.plan_id, WorkoutItems.id)
+    ).mappings()
+    for item in items:
+        plans[item["plan_id"]]["exercises"].append(
+            {
+                "id": item["id"],
+                "sets": item["sets"],
+                "reps": item["reps"],
+                "weight": item["weight"],
+                "rest_seconds": item["rest_seconds"],
+                "exercise": {
+                    "category": item["category"],
+                    "title": item["title"],
+                    "description": item["description"],
+                },
+            }
+        )
+    return list(plans.values())
+
+
+@router.get("/full", response_model=List[WorkoutPlanGeneralResponse])
+def get_full_plans(
+    ids: Annotated[
+        List[int], Query(min_length=1, max_length=MAX_FULL_PLANS)
+    ],
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_optional_user),
+) -> list[dict]:
+    return load_full_plans(db, ids, current_user)
+
+
+@router.get("/{id}/full", response_model=WorkoutPlanGeneralResponse)
+def get_full_plan(
+    id: int,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_optional_user),
+) -> dict:
+    plans = load_full_plans(db, [id], current_user)
+    if not plans:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return plans[0]
 
 
 @router.get("/{id}", response_model=WorkoutPlanResponse)
 def get_plan_by_id(
     id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: Optional[dict] = Depends(get_optional_user),
-) -> RowMapping:
+) -> RowMapping | Response:
     query = select(
         WorkoutPlans.title.label("title"),
         WorkoutPlans.description.label("description"),
         WorkoutPlans.created_at.label("created_at"),
-    )
-    if current_user:
-        query = query.where(
-            (WorkoutPlans.id == id),
-            (WorkoutPlans.user_id == current_user.id)  # type: ignore
-            | WorkoutPlans.is_public.is_(True),
-        )
-        plan: RowMapping | None = db.execute(query).mappings().first()
-    else:
-        query = query.where(
-            WorkoutPlans.id == id, WorkoutPlans.is_public.is_(True)
-        )
-        plan: RowMapping | None = db.execute(query).mappings().first()
+        WorkoutPlans.id.label("id"),
+        WorkoutPlans.updated_at.label("updated_at"),
+    ).where(WorkoutPlans.id == id, visible_plans(current_user))
+    plan: RowMapping | None = db.execute(query).mappings().first()
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
+    cached = not_modified(
+        request, response, plan_versions([plan]), current_user
+    )
+    if cached:
+        return cached
     return plan
 
 
@@ -101,23 +240,13 @@ def delete_plan(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> None:
-    delete_plan: RowMapping | None = db.execute(
-        select(WorkoutPlans).where(WorkoutPlans.id == id)
-    ).scalar_one_or_none()
-    if not delete_plan:
-        raise HTTPException(
-            status_code=404, detail="Plan is not found"
-        )
-    if delete_plan.user_id != current_user.id:
-        raise HTTPException(
-            status_code=404, detail="Exercise is not found"
-        )
-    try:
-        db.delete(delete_plan)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
+    delete_owned(
+        db,
+        WorkoutPlans,
+        WorkoutPlans.id == id,
+        WorkoutPlans.user_id == current_user.id,
+        not_found="Plan is not found",
+    )
 
 
 @router.put("/plans/{id}", status_code=205)
@@ -127,23 +256,12 @@ def edit_plan(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> Response:
-    update_plan: RowMapping | None = db.execute(
-        select(WorkoutPlans).where(WorkoutPlans.id == id)
-    ).scalar_one_or_none()
-
-    if not update_plan:
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    if update_plan.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Plan not found")
-
-    new_plan: dict = plan.model_dump(exclude_unset=True)
-    try:
-        for k, v in new_plan.items():
-            setattr(update_plan, k, v)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    db.refresh(update_plan)
+    update_owned(
+        db,
+        WorkoutPlans,
+        WorkoutPlans.id == id,
+        WorkoutPlans.user_id == current_user.id,
+        plan.model_dump(exclude_unset=True),
+        not_found="Plan not found",
+    )
     return Response(status_code=205)
@@ -1,19 +1,31 @@
 from database import Base
 from sqlalchemy import (
     String,
+    BigInteger,
+    Date,
     Boolean,
     text,
     Integer,
     ForeignKey,
     DECIMAL,
     Enum,
+    Index,
+    DDL,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from datetime import datetime
+from datetime import date, datetime
 from sqlalchemy.types import TIMESTAMP
 
 from schemas.schemas import WorkoutStatus
 
+# trigram indexes below need the extension before create_all builds them
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+
 
 class User(Base):
     """users table"""
@@ -28,6 +40,9 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(
         Boolean, nullable=False, server_default=text("true")
     )
+    token_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
 
     workout_plans = relationship(
         "WorkoutPlans", back_populates="user"
@@ -37,6 +52,36 @@ class User(Base):
     )
     workout_logs = relationship("WorkoutLog", back_populates="user")
     users = relationship("Exercise", back_populates="user")
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user"
+    )
+
+
+class RefreshToken(Base):
+    """refresh_tokens table"""
+
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    token_digest: Mapped[str] = mapped_column(
+        String(64), nullable=False, unique=True, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=text("now()")
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
+    user = relationship("User", back_populates="refresh_tokens")
+
+    __table_args__ = (Index("ix_refresh_tokens_user_id", "user_id"),)
 
 
 class ExerciseCategory(Base):
@@ -56,6 +101,20 @@ class Exercise(Base):
     """exercise table"""
 
     __tablename__ = "exercise"
+    __table_args__ = (
+        Index("ix_exercise_owner_id", "owner_id", "id"),
+        Index(
+            "ix_exercise_global",
+            "id",
+            postgresql_where=text("is_global IS TRUE"),
+        ),
+        Index(
+            "ix_exercise_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -90,6 +149,24 @@ class WorkoutPlans(Base):
     """workout_plans table"""
 
     __tablename__ = "workout_plans"
+    __table_args__ = (
+        Index(
+            "ix_workout_plans_user_id_created_at",
+            "user_id",
+            "created_at",
+        ),
+        Index(
+            "ix_workout_plans_public_created_at",
+            "created_at",
+            postgresql_where=text("is_public IS TRUE"),
+        ),
+        Index(
+            "ix_workout_plans_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -105,6 +182,13 @@ class WorkoutPlans(Base):
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=text("now()")
     )
+    # with the plan count this versions the plans a user can see
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+        onupdate=text("now()"),
+    )
 
     user = relationship("User", back_populates="workout_plans")
     items = relationship("WorkoutItems", back_populates="plan")
@@ -118,6 +202,9 @@ class WorkoutItems(Base):
     """workout_items table"""
 
     __tablename__ = "workout_items"
+    __table_args__ = (
+        Index("ix_workout_items_plan_id", "plan_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     plan_id: Mapped[int] = mapped_column(
@@ -152,6 +239,13 @@ class ScheduledWorkout(Base):
     """
 
     __tablename__ = "scheduled_workout"
+    __table_args__ = (
+        Index(
+            "ix_scheduled_workout_user_id_scheduled_at",
+            "user_id",
+            "scheduled_at",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -191,6 +285,14 @@ class WorkoutLog(Base):
     """workout_log table"""
 
     __tablename__ = "workout_log"
+    __table_args__ = (
+        Index(
+            "ix_workout_log_user_id_started_at",
+            "user_id",
+            "started_at",
+            postgresql_include=["id"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -223,6 +325,16 @@ class WorkoutLogItems(Base):
     """workout_log_items table"""
 
     __tablename__ = "workout_log_items"
+    __table_args__ = (
+        # the included columns cover the volume aggregation, no heap
+        # access per set
+        Index(
+            "ix_workout_log_items_log_id_set_number",
+            "log_id",
+            "set_number",
+            postgresql_include=["exercise_id", "reps", "weight"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     log_id: Mapped[int] = mapped_column(
@@ -244,3 +356,355 @@ class WorkoutLogItems(Base):
         "WorkoutItems", back_populates="workout_items"
     )
     exer = relationship("Exercise", back_populates="log")
+
+
+class TableVersion(Base):
+    """table_versions table, change counters behind the ETags"""
+
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("0")
+    )
+
+
+# shared tables whose writes invalidate the cached catalog reads. Plans
+# are versioned per user from their own rows instead, so a plan write
+# does not contend on a counter or invalidate every user's ETags.
+VERSIONED_TABLES: tuple[str, ...] = (
+    "exercise",
+    "exercise_category",
+)
+
+BUMP_TABLE_VERSION = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_versions (name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (name)
+    DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# statement level, a bulk write bumps the counter once
+event.listen(Base.metadata, "after_create", DDL(BUMP_TABLE_VERSION))
+for table in VERSIONED_TABLES:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(
+            f"CREATE OR REPLACE TRIGGER {table}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        ),
+    )
+
+
+class PersonalRecord(Base):
+    """
+    personal_records table, best sets per user and exercise kept up to
+    date by triggers on workout_log_items and workout_log
+    """
+
+    __tablename__ = "personal_records"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercise.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    max_weight: Mapped[float] = mapped_column(DECIMAL(5, 2))
+    max_weight_reps: Mapped[int] = mapped_column(Integer)
+    max_reps: Mapped[int] = mapped_column(Integer, nullable=False)
+    epley_1rm: Mapped[float] = mapped_column(DECIMAL(7, 2))
+    brzycki_1rm: Mapped[float] = mapped_column(DECIMAL(7, 2))
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+
+# estimated 1RMs only come from sets Brzycki is defined for
+RECORD_AGGREGATES = """
+    max(i.weight),
+    (array_agg(i.reps ORDER BY i.weight DESC, i.reps DESC)
+        FILTER (WHERE i.weight IS NOT NULL))[1],
+    max(i.reps),
+    round(max(i.weight * (1 + i.reps / 30.0))
+        FILTER (WHERE i.reps <= 36), 2),
+    round(max(i.weight * 36 / (37 - i.reps))
+        FILTER (WHERE i.reps <= 36), 2),
+    now()
+"""
+
+RECORD_COLUMNS = (
+    "user_id, exercise_id, max_weight, max_weight_reps, max_reps, "
+    "epley_1rm, brzycki_1rm, updated_at"
+)
+
+RECOMPUTE_PERSONAL_RECORDS = f"""
+CREATE OR REPLACE FUNCTION recompute_personal_records(
+    user_ids integer[], exercise_ids integer[]
+) RETURNS void AS $$
+BEGIN
+    DELETE FROM personal_records pr
+    USING unnest(user_ids, exercise_ids) AS p(user_id, exercise_id)
+    WHERE pr.user_id = p.user_id AND pr.exercise_id = p.exercise_id;
+    INSERT INTO personal_records ({RECORD_COLUMNS})
+    SELECT l.user_id, i.exercise_id, {RECORD_AGGREGATES}
+    FROM unnest(user_ids, exercise_ids) AS p(user_id, exercise_id)
+    JOIN workout_log l ON l.user_id = p.user_id
+    JOIN workout_log_items i
+        ON i.log_id = l.id AND i.exercise_id = p.exercise_id
+    WHERE i.reps > 0
+    GROUP BY l.user_id, i.exercise_id;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# new sets are merged into the records, changed or removed ones may
+# have been the record, so their pairs are recomputed from history
+LOG_ITEMS_PERSONAL_RECORDS = f"""
+CREATE OR REPLACE FUNCTION log_items_personal_records()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO personal_records AS pr ({RECORD_COLUMNS})
+        SELECT l.user_id, i.exercise_id, {RECORD_AGGREGATES}
+        FROM new_items i
+        JOIN workout_log l ON l.id = i.log_id
+        WHERE i.exercise_id IS NOT NULL AND i.reps > 0
+        GROUP BY l.user_id, i.exercise_id
+        ON CONFLICT (user_id, exercise_id) DO UPDATE SET
+            max_weight_reps = CASE
+                WHEN pr.max_weight IS NULL
+                    OR excluded.max_weight > pr.max_weight
+                    THEN excluded.max_weight_reps
+                WHEN excluded.max_weight = pr.max_weight
+                    THEN greatest(
+                        pr.max_weight_reps, excluded.max_weight_reps
+                    )
+                ELSE pr.max_weight_reps
+            END,
+            max_weight = greatest(pr.max_weight, excluded.max_weight),
+            max_reps = greatest(pr.max_reps, excluded.max_reps),
+            epley_1rm = greatest(pr.epley_1rm, excluded.epley_1rm),
+            brzycki_1rm = greatest(
+                pr.brzycki_1rm, excluded.brzycki_1rm
+            ),
+            updated_at = excluded.updated_at;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM recompute_personal_records(
+            array_agg(pairs.user_id), array_agg(pairs.exercise_id)
+        )
+        FROM (
+            SELECT DISTINCT l.user_id, i.exercise_id
+            FROM (
+                SELECT log_id, exercise_id FROM old_items
+                UNION SELECT log_id, exercise_id FROM new_items
+            ) i
+            JOIN workout_log l ON l.id = i.log_id
+            WHERE i.exercise_id IS NOT NULL
+        ) pairs;
+    ELSE
+        PERFORM recompute_personal_records(
+            array_agg(pairs.user_id), array_agg(pairs.exercise_id)
+        )
+        FROM (
+            SELECT DISTINCT l.user_id, i.exercise_id
+            FROM old_items i
+            JOIN workout_log l ON l.id = i.log_id
+            WHERE i.exercise_id IS NOT NULL
+        ) pairs;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# sets deleted by the cascade could no longer be joined to their log,
+# so a log's sets are deleted while it still exists and only the pairs
+# they held are recomputed by the workout_log_items trigger
+DELETE_LOG_ITEMS = """
+CREATE OR REPLACE FUNCTION delete_log_items()
+RETURNS trigger AS $$
+BEGIN
+    DELETE FROM workout_log_items WHERE log_id = OLD.id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# transition tables allow only one event per trigger
+PERSONAL_RECORD_TRIGGERS: tuple[str, ...] = (
+    "CREATE OR REPLACE TRIGGER workout_log_items_records_insert "
+    "AFTER INSERT ON workout_log_items "
+    "REFERENCING NEW TABLE AS new_items FOR EACH STATEMENT "
+    "EXECUTE FUNCTION log_items_personal_records()",
+    "CREATE OR REPLACE TRIGGER workout_log_items_records_update "
+    "AFTER UPDATE ON workout_log_items "
+    "REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items "
+    "FOR EACH STATEMENT EXECUTE FUNCTION log_items_personal_records()",
+    "CREATE OR REPLACE TRIGGER workout_log_items_records_delete "
+    "AFTER DELETE ON workout_log_items "
+    "REFERENCING OLD TABLE AS old_items FOR EACH STATEMENT "
+    "EXECUTE FUNCTION log_items_personal_records()",
+    "CREATE OR REPLACE TRIGGER workout_log_delete_items "
+    "BEFORE DELETE ON workout_log "
+    "FOR EACH ROW EXECUTE FUNCTION delete_log_items()",
+)
+
+for statement in (
+    RECOMPUTE_PERSONAL_RECORDS,
+    LOG_ITEMS_PERSONAL_RECORDS,
+    DELETE_LOG_ITEMS,
+    *PERSONAL_RECORD_TRIGGERS,
+):
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
+
+class RollupChange(Base):
+    """
+    rollup_changes table, days touched by writes to the tables behind
+    workout_rollups. txid is the writing transaction, compared with the
+    refresher's watermark.
+    """
+
+    __tablename__ = "rollup_changes"
+    __table_args__ = (Index("ix_rollup_changes_txid", "txid"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+    )
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    touched_on: Mapped[date] = mapped_column(Date, nullable=False)
+
+
+class RollupWatermark(Base):
+    """rollup_watermarks table, how far each rollup is refreshed"""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+
+class WorkoutRollup(Base):
+    """workout_rollups table, per user totals of a UTC week or month"""
+
+    __tablename__ = "workout_rollups"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    period: Mapped[str] = mapped_column(String(5), primary_key=True)
+    bucket: Mapped[date] = mapped_column(Date, primary_key=True)
+    workouts: Mapped[int] = mapped_column(Integer, nullable=False)
+    duration_seconds: Mapped[int] = mapped_column(
+        BigInteger, nullable=False
+    )
+    sets: Mapped[int] = mapped_column(Integer, nullable=False)
+    volume: Mapped[float] = mapped_column(
+        DECIMAL(14, 2), nullable=False
+    )
+    completed: Mapped[int] = mapped_column(Integer, nullable=False)
+    missed: Mapped[int] = mapped_column(Integer, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+
+RECORD_ROLLUP_CHANGES = """
+CREATE OR REPLACE FUNCTION record_rollup_changes() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'workout_log' THEN
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO rollup_changes (user_id, touched_on)
+            SELECT DISTINCT user_id, (started_at AT TIME ZONE 'UTC')::date
+            FROM new_rows WHERE started_at IS NOT NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO rollup_changes (user_id, touched_on)
+            SELECT DISTINCT user_id, (started_at AT TIME ZONE 'UTC')::date
+            FROM old_rows WHERE started_at IS NOT NULL;
+        END IF;
+    ELSIF TG_TABLE_NAME = 'scheduled_workout' THEN
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO rollup_changes (user_id, touched_on)
+            SELECT DISTINCT user_id,
+                (scheduled_at AT TIME ZONE 'UTC')::date
+            FROM new_rows
+            WHERE scheduled_at IS NOT NULL AND user_id IS NOT NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO rollup_changes (user_id, touched_on)
+            SELECT DISTINCT user_id,
+                (scheduled_at AT TIME ZONE 'UTC')::date
+            FROM old_rows
+            WHERE scheduled_at IS NOT NULL AND user_id IS NOT NULL;
+        END IF;
+    ELSE
+        -- sets of a deleted log are covered by the log's own change
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO rollup_changes (user_id, touched_on)
+            SELECT DISTINCT l.user_id,
+                (l.started_at AT TIME ZONE 'UTC')::date
+            FROM new_rows i JOIN workout_log l ON l.id = i.log_id
+            WHERE l.started_at IS NOT NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO rollup_changes (user_id, touched_on)
+            SELECT DISTINCT l.user_id,
+                (l.started_at AT TIME ZONE 'UTC')::date
+            FROM old_rows i JOIN workout_log l ON l.id = i.log_id
+            WHERE l.started_at IS NOT NULL;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+ROLLUP_SOURCE_TABLES: tuple[str, ...] = (
+    "workout_log",
+    "workout_log_items",
+    "scheduled_workout",
+)
+
+ROLLUP_TRANSITIONS: dict[str, str] = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+event.listen(
+    Base.metadata, "after_create", DDL(RECORD_ROLLUP_CHANGES)
+)
+for table in ROLLUP_SOURCE_TABLES:
+    for operation, transition in ROLLUP_TRANSITIONS.items():
+        event.listen(
+            Base.metadata,
+            "after_create",
+            DDL(
+                f"CREATE OR REPLACE TRIGGER "
+                f"{table}_rollup_{operation.lower()} "
+                f"AFTER {operation} ON {table} "
+                f"REFERENCING {transition} FOR EACH STATEMENT "
+                "EXECUTE FUNCTION record_rollup_changes()"
+            ),
+        )
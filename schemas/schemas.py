@@ -7,7 +7,7 @@ from pydantic import (
 )
 from pydantic import model_validator
 from pydantic_settings import SettingsConfigDict
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
 
 
@@ -68,7 +68,7 @@ class WorkoutLogItemCreate(BaseModel):
 
 class WorkoutLogItemsRequest(BaseModel):
     log_id: int
-    items: List[WorkoutLogItemCreate]
+    items: List[WorkoutLogItemCreate] = Field(..., min_length=1)
 
 
 class WorkoutLogItemsUpdate(BaseModel):
@@ -126,7 +126,7 @@ class WorkoutLogCreate(BaseModel):
 
 class WorkoutItemCreate(BaseModel):
     plan_id: int
-    exercise_id: list[int]
+    exercise_id: list[int] = Field(..., min_length=1)
     sets: Annotated[int, AfterValidator(is_positive)]
     reps: str
     weight: Annotated[float, AfterValidator(is_positive)]
@@ -146,6 +146,17 @@ class UserResponse(BaseModel):
     model_config = SettingsConfigDict(from_attributes=True)
 
 
+class UserSnapshot(BaseModel):
+    id: int
+    email: str
+    is_active: bool
+    token_version: int = 0
+
+    model_config = SettingsConfigDict(
+        from_attributes=True, frozen=True
+    )
+
+
 class ExerciseResponse(BaseModel):
     category: str
     title: str
@@ -189,9 +200,9 @@ class WorkoutLogItemsResponse(BaseModel):
 class WorkoutItemResponse(BaseModel):
     id: int
     sets: int
-    reps: int
-    weight: float
-    rest_seconds: int
+    reps: str
+    weight: Optional[float]
+    rest_seconds: Optional[int]
     exercise: ExerciseResponse
 
     model_config = SettingsConfigDict(from_attributes=True)
@@ -272,6 +283,7 @@ class ScheduleUpdate(BaseModel):
 
 
 class WorkoutPlanGeneralResponse(WorkoutPlanResponse):
+    id: int
     user_id: int
     exercises: List[WorkoutItemResponse]
 
@@ -286,6 +298,69 @@ class WorkoutLogResponse(BaseModel):
     notes: str
 
 
+class ExportRow(BaseModel):
+    log_id: int
+    plan_id: Optional[int]
+    started_at: Optional[datetime]
+    ended_at: Optional[datetime]
+    log_notes: Optional[str]
+    item_id: Optional[int]
+    exercise_id: Optional[int]
+    exercise_name: Optional[str]
+    set_number: Optional[int]
+    reps: Optional[int]
+    weight: Optional[float]
+    item_notes: Optional[str]
+
+
+class VolumePoint(BaseModel):
+    bucket: date
+    exercise_id: int
+    exercise: str
+    sets: int
+    reps: int
+    volume: float
+
+
+class RollupResponse(BaseModel):
+    bucket: date
+    workouts: int
+    duration_seconds: int
+    sets: int
+    volume: float
+    completed: int
+    missed: int
+
+
+class ExerciseProgression(BaseModel):
+    exercise_id: int
+    sessions: int
+    best_e1rm: float
+    rolling_e1rm: float
+    trend_per_week: Optional[float]
+    plateau: bool
+    last_trained: date
+
+
+class ProgressionResponse(BaseModel):
+    sets: int
+    acute_load: float
+    chronic_load: float
+    acwr: Optional[float]
+    exercises: List[ExerciseProgression]
+
+
+class PersonalRecordResponse(BaseModel):
+    exercise_id: int
+    exercise: str
+    max_weight: Optional[float]
+    max_weight_reps: Optional[int]
+    max_reps: int
+    epley_1rm: Optional[float]
+    brzycki_1rm: Optional[float]
+    updated_at: datetime
+
+
 class UpdateLog(BaseModel):
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
@@ -326,12 +401,21 @@ class LoginRequest(UserCreate):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
     id: Optional[int] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+    ver: int = 0
 
 
 class PaginationParams(BaseModel):
     limit: int = Field(5, ge=5, le=20)
     offset: int = Field(0, ge=0, le=20)
+    cursor: Optional[str] = None
@@ -6,7 +6,34 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REFRESH_TOKEN_REVOKED_DAYS: int = 7
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str | None = None
+    DB_ASYNC: bool = False
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_STRATEGY: str = "round_robin"
+    READ_YOUR_WRITES_SECONDS: float = 5
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    THREADPOOL_TOKENS: int | None = None
+    SQL_REPEAT_WARN_THRESHOLD: int = 5
+    METRICS_ENABLED: bool = False
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60
+    HASH_POOL_KIND: str = "thread"
+    HASH_POOL_WORKERS: int | None = None
+    HASH_POOL_MAX_PENDING: int = 64
+    BCRYPT_ROUNDS: int | None = None
+    BCRYPT_TARGET_MS: float = 250
+    AUTH_STATELESS: bool = False
+    AUTH_REVOCATION_REFRESH_SECONDS: float = 30
+    FAST_JSON: bool = False
+    CACHE_MAX_AGE_SECONDS: int = 60
+    ROLLUP_REFRESH_SECONDS: float = 60
 
     model_config = SettingsConfigDict(
         env_file=Path(__file__).parent / ".env",
@@ -0,0 +1,6 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from query_budget import query_budgets  # noqa: E402, F401
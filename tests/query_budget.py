@@ -0,0 +1,84 @@
+import json
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+
+BUDGETS_FILE = Path(__file__).parent / "query_budgets.json"
+SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) statements"')
+
+
+def load_budgets() -> dict:
+    with open(BUDGETS_FILE) as file:
+        return json.load(file)
+
+
+# "METHOD /path/{param}" of the route that serves the request
+def route_key(app, method: str, url: str) -> str | None:
+    scope = {
+        "type": "http",
+        "path": urlsplit(str(url)).path,
+        "root_path": "",
+        "method": method.upper(),
+    }
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{method.upper()} {route.path}"
+    return None
+
+
+def check_budget(budgets: dict, key: str, response) -> None:
+    # Server-Timing is sent before a streamed body runs its queries, so
+    # streaming routes can not be measured this way
+    if key in budgets["streaming"]:
+        return
+    budget: dict | None = budgets["routes"].get(key)
+    if budget is None:
+        pytest.fail(
+            f"No query budget for {key} in {BUDGETS_FILE.name}"
+        )
+    timing = SERVER_TIMING.search(
+        response.headers.get("Server-Timing", "")
+    )
+    if not timing:
+        pytest.fail(f"{key} responded without a Server-Timing header")
+    db_ms, statements = float(timing[1]), int(timing[2])
+    max_db_ms: float = budget.get("db_ms", budgets["default_db_ms"])
+    if statements > budget["statements"]:
+        pytest.fail(
+            f"{key} ran {statements} SQL statements, "
+            f"budget is {budget['statements']}"
+        )
+    if db_ms > max_db_ms:
+        pytest.fail(
+            f"{key} spent {db_ms:.1f} ms in the database, "
+            f"budget is {max_db_ms} ms"
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def query_budgets():
+    """
+    Checks every request made through a TestClient against the budget
+    of its route in query_budgets.json
+    """
+    budgets = load_budgets()
+    original = TestClient.request
+
+    def request(self, method, url, *args, **kwargs):
+        response = original(self, method, url, *args, **kwargs)
+        key = route_key(self.app, method, url)
+        if key is not None:
+            check_budget(budgets, key, response)
+        return response
+
+    TestClient.request = request  # type: ignore
+    yield budgets
+    TestClient.request = original  # type: ignore
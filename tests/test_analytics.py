@@ -0,0 +1,41 @@
+from datetime import date
+import sys
+import os
+
+from sqlalchemy.dialects import postgresql
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from routers.analytics import volume_query  # noqa: E402
+
+
+def compiled(query) -> str:
+    return str(
+        query.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+
+
+def test_volume_query_fills_gaps():
+    sql = compiled(
+        volume_query(
+            1, "month", date(2025, 1, 15), date(2025, 12, 31)
+        )
+    )
+    assert "generate_series(date_trunc('month', '2025-01-15" in sql
+    assert "CAST('1 month' AS INTERVAL)" in sql
+    assert "LEFT OUTER JOIN totals" in sql
+    # end is inclusive
+    assert "started_at < '2026-01-01 00:00:00+00:00'" in sql
+
+
+def test_volume_query_filters_exercise():
+    sql = compiled(
+        volume_query(1, "day", date(2025, 1, 1), date(2025, 1, 7), 3)
+    )
+    assert "workout_log_items.exercise_id = 3" in sql
+    assert "workout_log.user_id = 1" in sql
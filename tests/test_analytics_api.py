@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+from training_data import (  # noqa: E402
+    add_sets,
+    create_log,
+    new_user,
+    seed_training,
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def volume_data(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id)
+    first, second = seed["exercise_ids"]
+    # 2025-03-04 04:30 UTC, still the 3rd in the client's time zone
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(
+            2025, 3, 3, 23, 30, tzinfo=timezone(timedelta(hours=-5))
+        ),
+    )
+    add_sets(
+        client,
+        headers,
+        log,
+        [(first, 5, 100), (first, 5, 100), (second, 10, 20)],
+    )
+    # last minute of the week starting Monday 2025-03-03
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 3, 9, 23, 59, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, log, [(first, 3, 110)])
+    # first second of the next week
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 3, 10, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, log, [(first, 2, 120)])
+    return headers, seed
+
+
+def point(
+    bucket: str, exercise_id: int, name: str, sets, reps, volume
+):
+    return {
+        "bucket": bucket,
+        "exercise_id": exercise_id,
+        "exercise": name,
+        "sets": sets,
+        "reps": reps,
+        "volume": volume,
+    }
+
+
+def test_daily_volume_fills_gaps_per_exercise(
+    client: TestClient, volume_data
+):
+    headers, seed = volume_data
+    first, second = seed["exercise_ids"]
+    first_name, second_name = seed["exercise_names"]
+    response = client.get(
+        "/analytics/volume",
+        params={
+            "bucket": "day",
+            "start": "2025-03-03",
+            "end": "2025-03-05",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    # the log started late on the 3rd in UTC-5 counts for the 4th (UTC)
+    assert response.json() == [
+        point("2025-03-03", first, first_name, 0, 0, 0),
+        point("2025-03-04", first, first_name, 2, 10, 1000),
+        point("2025-03-05", first, first_name, 0, 0, 0),
+        point("2025-03-03", second, second_name, 0, 0, 0),
+        point("2025-03-04", second, second_name, 1, 10, 200),
+        point("2025-03-05", second, second_name, 0, 0, 0),
+    ]
+
+
+def test_weekly_volume_splits_at_monday(
+    client: TestClient, volume_data
+):
+    headers, seed = volume_data
+    first = seed["exercise_ids"][0]
+    first_name = seed["exercise_names"][0]
+    response = client.get(
+        "/analytics/volume",
+        params={
+            "bucket": "week",
+            "start": "2025-03-03",
+            "end": "2025-03-16",
+            "exercise_id": first,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        point("2025-03-03", first, first_name, 3, 13, 1330),
+        point("2025-03-10", first, first_name, 1, 2, 240),
+    ]
+
+
+def test_volume_outside_range_is_empty(
+    client: TestClient, volume_data
+):
+    headers, _ = volume_data
+    response = client.get(
+        "/analytics/volume",
+        params={
+            "bucket": "month",
+            "start": "2024-01-01",
+            "end": "2024-12-31",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,100 @@
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+import asyncio  # noqa: E402
+import csv  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+
+from schemas.schemas import WorkoutLogItemCreate  # noqa: E402
+from utility.bulk_import import (  # noqa: E402
+    column_error,
+    parse_rows,
+    spool_body,
+    spooled_lines,
+)
+
+
+def test_csv_empty_cells_are_missing():
+    lines = iter(
+        ["exercise_id,set_number,reps,weight,notes\n", "1,1,5,60,\n"]
+    )
+    assert list(parse_rows(lines, False)) == [
+        (
+            1,
+            {
+                "exercise_id": "1",
+                "set_number": "1",
+                "reps": "5",
+                "weight": "60",
+                "notes": None,
+            },
+        )
+    ]
+
+
+def test_broken_ndjson_line_does_not_stop_import():
+    lines = iter(
+        ['{"reps": 1}\n', "{broken\n", "\n", '{"reps": 2}\n']
+    )
+    rows = list(parse_rows(lines, True))
+    assert rows[0] == (1, {"reps": 1})
+    assert rows[1][0] == 2
+    assert isinstance(rows[1][1], ValueError)
+    # numbered by line, the blank line 3 is counted
+    assert rows[2] == (4, {"reps": 2})
+
+
+def test_unreadable_csv_rejects_the_whole_file():
+    too_long = "x" * (csv.field_size_limit() + 1)
+    lines = iter(
+        ["exercise_id,notes\n", "1,ok\n", f"1,{too_long}\n", "1,ok\n"]
+    )
+    rows = parse_rows(lines, False)
+    assert next(rows) == (1, {"exercise_id": "1", "notes": "ok"})
+    with pytest.raises(HTTPException) as error:
+        list(rows)
+    assert error.value.status_code == 422
+    assert "after line 2" in error.value.detail
+
+
+def test_spooled_body_keeps_lines_split_across_chunks():
+    async def chunks():
+        for chunk in (
+            b'{"reps": 1}\n{"re',
+            b'ps": 2}\n',
+            b"\xc3\xa9",
+        ):
+            yield chunk
+
+    spool = asyncio.run(spool_body(chunks()))
+    assert list(spooled_lines(spool)) == [
+        '{"reps": 1}\n',
+        '{"reps": 2}\n',
+        "\u00e9",
+    ]
+
+
+def test_invalid_utf8_is_rejected():
+    async def chunks():
+        yield b'{"reps": 1}\n\xff\n'
+
+    spool = asyncio.run(spool_body(chunks()))
+    with pytest.raises(HTTPException) as error:
+        list(parse_rows(spooled_lines(spool), True))
+    assert error.value.status_code == 422
+
+
+def test_column_limits():
+    item = WorkoutLogItemCreate(
+        exercise_id=1, set_number=1, reps=5, weight=60
+    )
+    assert column_error(item) is None
+    assert column_error(item.model_copy(update={"weight": 1000}))
+    assert column_error(item.model_copy(update={"reps": 2**31}))
+    assert column_error(item.model_copy(update={"notes": "x" * 301}))
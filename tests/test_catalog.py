@@ -0,0 +1,85 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from schemas.schemas import PaginationParams  # noqa: E402
+from utility.catalog import (  # noqa: E402
+    Catalog,
+    CatalogEntry,
+    CatalogSnapshot,
+    similarity,
+    trigrams,
+)
+from utility.pagination import next_cursor  # noqa: E402
+
+versions = (("exercise", 2), ("exercise_category", 1))
+snapshot = CatalogSnapshot(
+    versions,
+    [
+        CatalogEntry(1, "chest", "Bench press", None),
+        CatalogEntry(2, "legs", "Back squat", None),
+        CatalogEntry(3, "chest", "Incline bench press", None),
+        CatalogEntry(4, "back", "Deadlift", None),
+        CatalogEntry(5, "back", "Barbell row", None),
+        CatalogEntry(6, "legs", "Front squat", None),
+    ],
+)
+
+
+def test_trigrams_follow_pg_trgm():
+    # SELECT show_trgm('Cat') gives {"  c"," ca","at ",cat}
+    assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+    # similarity('word', 'two words') is 0.36363637 in Postgres
+    assert (
+        similarity(trigrams("word"), trigrams("two words")) == 4 / 11
+    )
+
+
+def test_pages_follow_the_cursor():
+    pagination = PaginationParams(limit=5)
+    first = snapshot.list(pagination, None, 0.3)
+    assert [row["cursor_0"] for row in first] == [1, 2, 3, 4, 5]
+    cursor = next_cursor(first, pagination)
+    second = snapshot.list(
+        PaginationParams(limit=5, cursor=cursor), None, 0.3
+    )
+    assert [row["title"] for row in second] == ["Front squat"]
+
+
+def test_search_ranks_by_similarity():
+    rows = snapshot.list(PaginationParams(), "bench", 0.3)
+    assert [row["title"] for row in rows] == [
+        "Bench press",
+        "Incline bench press",
+    ]
+    assert (
+        snapshot.list(PaginationParams(), "squat", 0.3)[0]["category"]
+        == "legs"
+    )
+
+
+def test_stale_versions_are_not_served():
+    catalog = Catalog()
+    catalog._snapshot = snapshot
+    assert catalog.fresh(list(versions)) is snapshot
+    assert (
+        catalog.fresh([("exercise", 3), ("exercise_category", 1)])
+        is None
+    )
+    catalog.invalidate()
+    assert catalog.fresh(list(versions)) is None
+
+
+def test_concurrent_hits_are_all_counted():
+    catalog = Catalog()
+    catalog._snapshot = snapshot
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(8):
+            pool.submit(
+                lambda: [catalog.fresh(versions) for _ in range(5000)]
+            )
+    assert catalog.stats()["hits"] == 40000
@@ -0,0 +1,80 @@
+import sys
+import os
+from datetime import datetime, timezone
+
+from fastapi import Request, Response
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from routers.workouts import plan_versions  # noqa: E402
+from schemas.schemas import UserSnapshot  # noqa: E402
+from utility.etag import make_etag, not_modified  # noqa: E402
+
+user = UserSnapshot(id=1, email="user@example.com", is_active=True)
+versions = [("exercise", 3), ("exercise_category", 1)]
+
+
+def make_request(query: str = "", etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/exercise/",
+            "query_string": query.encode(),
+            "headers": headers,
+        }
+    )
+
+
+def test_etag_changes_with_version_user_and_query():
+    etag = make_etag(make_request(), versions, None)
+    assert etag != make_etag(make_request(), [("exercise", 4)], None)
+    assert etag != make_etag(make_request(), versions, user)
+    assert etag != make_etag(make_request("limit=10"), versions, None)
+
+
+def test_matching_etag_is_not_modified():
+    etag = make_etag(make_request(), versions, None)
+    response = Response()
+    cached = not_modified(
+        make_request(etag=f'W/{etag}, "other"'),
+        response,
+        versions,
+        None,
+    )
+    assert cached is not None
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.headers["Cache-Control"].startswith("public")
+
+
+def test_stale_etag_sets_headers_only():
+    response = Response()
+    assert (
+        not_modified(
+            make_request(etag='"old"'), response, versions, user
+        )
+        is None
+    )
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_plan_versions_follow_the_page():
+    updated = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    page = [
+        {"id": 1, "updated_at": updated},
+        {"id": 2, "updated_at": updated},
+    ]
+    edited = [
+        page[0],
+        {"id": 2, "updated_at": datetime.now(timezone.utc)},
+    ]
+    tags = {
+        make_etag(make_request(), plan_versions(rows), user)
+        for rows in (page, edited, page[:1], page[1:])
+    }
+    # an edit on the page or a page of other plans is a new version
+    assert len(tags) == 4
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+import json
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+from training_data import (  # noqa: E402
+    add_sets,
+    create_log,
+    new_user,
+    seed_training,
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def export(client: TestClient, headers: dict, **params) -> list:
+    response = client.get("/export/", params=params, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [
+        (
+            row["log_id"],
+            row["exercise_name"],
+            row["set_number"],
+            row["reps"],
+            row["weight"],
+        )
+        for row in map(json.loads, response.text.splitlines())
+    ]
+
+
+def test_export_requires_login(client: TestClient):
+    response = client.get("/export/")
+    assert response.status_code == 401
+
+
+def test_export_streams_ndjson(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id)
+    first, second = seed["exercise_ids"]
+    first_name, second_name = seed["exercise_names"]
+    older = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 5, 1, tzinfo=timezone.utc),
+    )
+    add_sets(
+        client, headers, older, [(first, 5, 100), (second, 8, 40)]
+    )
+    newer = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 5, 8, tzinfo=timezone.utc),
+    )
+    # oldest first, a log without sets still gets a line
+    assert export(client, headers) == [
+        (older, first_name, 1, 5, 100),
+        (older, second_name, 2, 8, 40),
+        (newer, None, None, None, None),
+    ]
+    assert export(
+        client, headers, started_after="2025-05-02T00:00:00Z"
+    ) == [(newer, None, None, None, None)]
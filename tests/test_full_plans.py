@@ -0,0 +1,93 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+from training_data import (  # noqa: E402
+    new_user,
+    private_plan,
+    seed_training,
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def plans(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id)
+    response = client.post(
+        "/workout_items/create",
+        json={
+            "plan_id": seed["plan_id"],
+            "exercise_id": seed["exercise_ids"],
+            "sets": 3,
+            "reps": "8-10",
+            "weight": 50,
+            "rest_seconds": 90,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return headers, seed, private_plan(user_id)
+
+
+def summary(plans: list) -> list:
+    return [
+        (
+            plan["id"],
+            [item["exercise"]["title"] for item in plan["exercises"]],
+        )
+        for plan in plans
+    ]
+
+
+def test_full_plan_not_found(client: TestClient):
+    response = client.get("/workoutplans/999999999/full")
+    assert response.status_code == 404
+
+
+def test_full_plan(client: TestClient, plans):
+    _, seed, _ = plans
+    response = client.get(f"/workoutplans/{seed['plan_id']}/full")
+    assert response.status_code == 200
+    assert summary([response.json()]) == [
+        (seed["plan_id"], seed["exercise_names"])
+    ]
+
+
+def test_full_plans_batch(client: TestClient, plans):
+    headers, seed, private = plans
+    ids = [seed["plan_id"], private, 999999999]
+    response = client.get(
+        "/workoutplans/full", params={"ids": ids}, headers=headers
+    )
+    assert response.status_code == 200
+    assert summary(response.json()) == [
+        (seed["plan_id"], seed["exercise_names"]),
+        (private, []),
+    ]
+
+    # other users only get the public plan
+    _, other = new_user(client)
+    response = client.get(
+        "/workoutplans/full", params={"ids": ids}, headers=other
+    )
+    assert response.status_code == 200
+    assert summary(response.json()) == [
+        (seed["plan_id"], seed["exercise_names"])
+    ]
+
+
+def test_full_plans_needs_ids(client: TestClient):
+    response = client.get("/workoutplans/full")
+    assert response.status_code == 422
@@ -0,0 +1,27 @@
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+import utility.hash as hash_module  # noqa: E402
+from utility.hash import (  # noqa: E402
+    get_rounds,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+
+
+def test_hash_uses_requested_rounds():
+    hashed = hash_password("12345678", 4)
+    assert get_rounds(hashed) == 4
+    assert verify_password("12345678", hashed)
+
+
+def test_needs_rehash_only_below_cost(monkeypatch):
+    monkeypatch.setattr(hash_module, "bcrypt_rounds", 5)
+    assert needs_rehash(hash_password("12345678", 4))
+    assert not needs_rehash(hash_password("12345678", 5))
+    assert not needs_rehash(hash_password("12345678", 6))
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+import sys
+import os
+
+import pytest
+from sqlalchemy import Select, select, text
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from database import engine  # noqa: E402
+from routers.exercises import exercises_query  # noqa: E402
+from routers.scheduled import schedules_query  # noqa: E402
+from routers.workout_items import items_query  # noqa: E402
+from routers.workout_log import logs_query  # noqa: E402
+from routers.workouts import plans_query  # noqa: E402
+from schemas.models import WorkoutLog, WorkoutLogItems  # noqa: E402
+from schemas.schemas import (  # noqa: E402
+    PaginationParams,
+    UserSnapshot,
+)
+from utility.pagination import encode_cursor  # noqa: E402
+
+user = UserSnapshot(id=1, email="user@example.com", is_active=True)
+pagination = PaginationParams()
+deep_page = PaginationParams(
+    cursor=encode_cursor([datetime(2025, 1, 1), 1000])
+)
+
+
+def explain(query: Select) -> str:
+    compiled = query.compile(
+        dialect=engine.dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    with engine.begin() as conn:
+        # tiny test tables are cheaper to scan, make the planner show
+        # whether an index can serve the query at all
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar_one()
+    return json.dumps(plan)
+
+
+@pytest.mark.parametrize(
+    "query, indexes",
+    [
+        (
+            exercises_query(pagination, user, ""),
+            ["ix_exercise_owner_id", "ix_exercise_global"],
+        ),
+        (
+            exercises_query(pagination, None, ""),
+            ["ix_exercise_global"],
+        ),
+        (
+            plans_query(pagination, user),
+            [
+                "ix_workout_plans_user_id_created_at",
+                "ix_workout_plans_public_created_at",
+            ],
+        ),
+        (
+            schedules_query(pagination, user),
+            ["ix_scheduled_workout_user_id_scheduled_at"],
+        ),
+        (
+            logs_query(pagination, user, ""),
+            ["ix_workout_log_user_id_started_at"],
+        ),
+        (
+            logs_query(deep_page, user, ""),
+            ["ix_workout_log_user_id_started_at"],
+        ),
+        (items_query(pagination, user), ["ix_workout_items_plan_id"]),
+        (
+            select(WorkoutLogItems)
+            .join(WorkoutLogItems.log)
+            .where(
+                WorkoutLogItems.log_id == 1,
+                WorkoutLog.user_id == user.id,
+            ),
+            ["ix_workout_log_items_log_id_set_number"],
+        ),
+    ],
+)
+def test_query_uses_index(query: Select, indexes: list[str]):
+    plan = explain(query)
+    for index in indexes:
+        assert index in plan
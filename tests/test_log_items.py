@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+from training_data import (  # noqa: E402
+    add_sets,
+    create_log,
+    new_user,
+    seed_training,
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_create_log_items_needs_items(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id, exercises=1)
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 6, 1, tzinfo=timezone.utc),
+    )
+    response = client.post(
+        "/workout_log_items/create_log_item",
+        json={"log_id": log, "items": []},
+        headers=headers,
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "items"]
+    # nothing was written for the log
+    response = client.get(
+        f"/workout_log_items/{log}/all", headers=headers
+    )
+    assert response.status_code == 404
+
+
+def test_create_log_items_counts_the_sets(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id, exercises=1)
+    exercise = seed["exercise_ids"][0]
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 6, 1, tzinfo=timezone.utc),
+    )
+    add_sets(
+        client, headers, log, [(exercise, 5, 100), (exercise, 5, 90)]
+    )
+    response = client.get(
+        f"/workout_log_items/{log}/all", headers=headers
+    )
+    assert response.status_code == 200
+    assert sorted(
+        (item["set_number"], item["reps"], item["weight"])
+        for item in response.json()
+    ) == [(1, 5, 100), (2, 5, 90)]
@@ -0,0 +1,57 @@
+import sys
+import os
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from schemas.schemas import UserSnapshot  # noqa: E402
+from settings import settings  # noqa: E402
+from utility.oauth2 import (  # noqa: E402
+    create_access_token,
+    resolve_user,
+    token_claims,
+    verify_access_token,
+)
+from utility.revocation import revocations  # noqa: E402
+
+credential_exception = HTTPException(status_code=401)
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+
+
+def make_token(id: int, version: int = 0) -> str:
+    user = UserSnapshot(
+        id=id,
+        email=f"user{id}@example.com",
+        is_active=True,
+        token_version=version,
+    )
+    return create_access_token(data=token_claims(user))
+
+
+def test_stateless_token_resolves_without_db(stateless):
+    token_d = verify_access_token(
+        make_token(9001), credential_exception
+    )
+    user = resolve_user(token_d, db=None)  # type: ignore
+    assert user is not None
+    assert user.email == "user9001@example.com"
+
+
+def test_revoked_token_version_is_rejected(stateless):
+    token_d = verify_access_token(
+        make_token(9002), credential_exception
+    )
+    revocations.revoke(9002, 1)
+    assert resolve_user(token_d, db=None) is None  # type: ignore
+    token_d = verify_access_token(
+        make_token(9002, 1), credential_exception
+    )
+    assert resolve_user(token_d, db=None) is not None  # type: ignore
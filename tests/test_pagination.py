@@ -0,0 +1,82 @@
+import sys
+import os
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from schemas.models import WorkoutPlans  # noqa: E402
+from schemas.schemas import PaginationParams  # noqa: E402
+from utility.pagination import (  # noqa: E402
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    paginate,
+)
+from utility.search import fuzzy_match  # noqa: E402
+
+
+def test_cursor_round_trip():
+    created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    cursor = encode_cursor([created, 42])
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == [created, 42]
+
+
+def test_invalid_cursor():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not a cursor")
+    assert error.value.status_code == 400
+
+
+def test_cursor_replaces_offset():
+    cursor = encode_cursor([datetime(2025, 1, 1), 7])
+    query = paginate(
+        select(WorkoutPlans.title),
+        [WorkoutPlans.created_at, WorkoutPlans.id],
+        PaginationParams(offset=10, cursor=cursor),
+        descending=True,
+    )
+    sql = str(query)
+    assert "OFFSET" not in sql
+    assert "(workout_plans.created_at, workout_plans.id) <" in sql
+
+
+def test_next_cursor_only_for_full_pages():
+    pagination = PaginationParams(limit=5)
+    rows = [{"title": "plan", "cursor_0": n} for n in range(5)]
+    assert decode_cursor(next_cursor(rows, pagination)) == [4]
+    assert next_cursor(rows[:4], pagination) is None
+
+
+@pytest.mark.parametrize(
+    "values", [["2025-01-01", 7], [{"t": "2025-01-01"}, "7"]]
+)
+def test_cursor_of_wrong_type(values):
+    # well-formed but of the wrong type would fail in the database
+    with pytest.raises(HTTPException) as error:
+        paginate(
+            select(WorkoutPlans.title),
+            [WorkoutPlans.created_at, WorkoutPlans.id],
+            PaginationParams(cursor=encode_cursor(values)),
+        )
+    assert error.value.status_code == 400
+
+
+def test_similarity_cursor_is_float8():
+    _, similarity = fuzzy_match(WorkoutPlans.title, "push")
+    query = paginate(
+        select(WorkoutPlans.title),
+        [similarity, WorkoutPlans.id],
+        PaginationParams(cursor=encode_cursor([0.5, 3])),
+        descending=True,
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    # the same float8 rank is selected, compared and ordered by
+    assert sql.count("AS FLOAT(53))") == 3
@@ -0,0 +1,94 @@
+from datetime import date, datetime, timezone
+import sys
+import os
+
+import pytest
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from utility.analytics import (  # noqa: E402
+    SECONDS_PER_DAY,
+    TrainingSets,
+    progression,
+)
+
+NOW = datetime(2025, 6, 30, 12, tzinfo=timezone.utc).timestamp()
+
+
+def days_ago(days: int) -> float:
+    return NOW - days * SECONDS_PER_DAY
+
+
+def by_exercise(result: dict) -> dict:
+    return {row["exercise_id"]: row for row in result["exercises"]}
+
+
+def test_progression_of_an_exercise():
+    # Epley of 3 reps is weight * 1.1
+    rows = [
+        (days_ago(10), 1, 3, 100.0),
+        (days_ago(10), 1, 3, 90.0),
+        (days_ago(3), 1, 3, 110.0),
+        (days_ago(400), 2, 5, 60.0),
+    ]
+    result = progression(TrainingSets.from_rows(rows), NOW)
+    exercises = by_exercise(result)
+    assert result["sets"] == 4
+    assert exercises[1]["sessions"] == 2
+    assert exercises[1]["best_e1rm"] == 121.0
+    assert exercises[1]["rolling_e1rm"] == 115.5
+    # 11 kg more in one week
+    assert exercises[1]["trend_per_week"] == 11.0
+    assert exercises[1]["last_trained"] == date(2025, 6, 27)
+    # nothing in the trend window
+    assert exercises[2]["trend_per_week"] is None
+    assert not exercises[1]["plateau"]
+
+
+def test_rolling_window_stays_in_exercise():
+    rows = [(days_ago(day), 1, 3, 100.0) for day in (9, 8)] + [
+        (days_ago(day), 2, 3, weight)
+        for day, weight in ((7, 10.0), (6, 20.0), (5, 30.0))
+    ]
+    exercises = by_exercise(
+        progression(TrainingSets.from_rows(rows), NOW, window=2)
+    )
+    assert exercises[1]["rolling_e1rm"] == 110.0
+    assert exercises[2]["rolling_e1rm"] == pytest.approx(27.5)
+
+
+def test_plateau():
+    climbing = [80.0, 85.0, 90.0, 100.0, 100.0, 100.0, 100.5, 99.0]
+    improving = [80.0, 85.0, 90.0, 100.0, 100.0, 100.0, 100.5, 105.0]
+    rows = [
+        (days_ago(30 - day), 1, 3, weight)
+        for day, weight in enumerate(climbing)
+    ] + [
+        (days_ago(30 - day), 2, 3, weight)
+        for day, weight in enumerate(improving)
+    ]
+    exercises = by_exercise(
+        progression(TrainingSets.from_rows(rows), NOW)
+    )
+    assert exercises[1]["plateau"]
+    assert not exercises[2]["plateau"]
+
+
+def test_workload_ratio():
+    rows = [
+        (days_ago(1), 1, 10, 100.0),
+        (days_ago(20), 1, 10, 100.0),
+        (days_ago(60), 1, 10, 100.0),
+    ]
+    result = progression(TrainingSets.from_rows(rows), NOW)
+    assert result["acute_load"] == 1000.0
+    assert result["chronic_load"] == 500.0
+    assert result["acwr"] == 2.0
+
+
+def test_no_sets():
+    result = progression(TrainingSets.from_rows([]), NOW)
+    assert result["exercises"] == []
+    assert result["acwr"] is None
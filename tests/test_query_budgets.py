@@ -0,0 +1,28 @@
+import sys
+import os
+
+from fastapi.routing import APIRoute
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+
+
+def test_every_route_has_a_budget(query_budgets):
+    missing = [
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+        if f"{method} {route.path}" not in query_budgets["routes"]
+        and f"{method} {route.path}" not in query_budgets["streaming"]
+    ]
+    assert missing == []
+
+
+def test_streaming_routes_have_no_budget(query_budgets):
+    assert not set(query_budgets["streaming"]) & set(
+        query_budgets["routes"]
+    )
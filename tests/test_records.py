@@ -0,0 +1,183 @@
+from datetime import datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+from training_data import (  # noqa: E402
+    add_sets,
+    create_log,
+    new_user,
+    seed_training,
+)
+
+FIELDS = (
+    "max_weight",
+    "max_weight_reps",
+    "max_reps",
+    "epley_1rm",
+    "brzycki_1rm",
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def records(client: TestClient, headers: dict) -> dict:
+    response = client.get("/records/", headers=headers)
+    assert response.status_code == 200
+    return {
+        record["exercise_id"]: tuple(
+            record[field] for field in FIELDS
+        )
+        for record in response.json()
+    }
+
+
+def test_records_require_login(client: TestClient):
+    response = client.get("/records/")
+    assert response.status_code == 401
+
+
+def test_records_of_user(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id, exercises=1)
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 1, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, log, [(seed["exercise_ids"][0], 6, 70)])
+    response = client.get("/records/", headers=headers)
+    assert response.status_code == 200
+    assert [
+        (
+            record["exercise_id"],
+            record["exercise"],
+            record["max_reps"],
+        )
+        for record in response.json()
+    ] == [(seed["exercise_ids"][0], seed["exercise_names"][0], 6)]
+
+    # a user without sets has no records, not those of others
+    _, other = new_user(client)
+    assert records(client, other) == {}
+
+
+def test_records_follow_log_item_writes(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id, exercises=1)
+    exercise = seed["exercise_ids"][0]
+    first = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 1, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, first, [(exercise, 5, 100)])
+    assert records(client, headers) == {
+        exercise: (100, 5, 5, 116.67, 112.5)
+    }
+
+    # a lighter set only moves max_reps, it does not replace the record
+    second = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 8, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, second, [(exercise, 8, 80)])
+    assert records(client, headers) == {
+        exercise: (100, 5, 8, 116.67, 112.5)
+    }
+
+    response = client.put(
+        f"/workout_log_items/{second}",
+        json={"weight": 120},
+        headers=headers,
+    )
+    assert response.status_code == 205
+    assert records(client, headers) == {
+        exercise: (120, 8, 8, 152, 148.97)
+    }
+
+    # deleting the record set recomputes it from what is left
+    response = client.delete(
+        f"/workout_log_items/{second}", headers=headers
+    )
+    assert response.status_code == 204
+    assert records(client, headers) == {
+        exercise: (100, 5, 5, 116.67, 112.5)
+    }
+
+    response = client.delete(f"/workout_log/{first}", headers=headers)
+    assert response.status_code == 204
+    assert records(client, headers) == {}
+
+
+def test_deleting_the_record_log_recomputes(client: TestClient):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id, exercises=1)
+    exercise = seed["exercise_ids"][0]
+    first = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 1, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, first, [(exercise, 3, 140)])
+    second = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 8, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, second, [(exercise, 10, 60)])
+    assert records(client, headers)[exercise][:3] == (140, 3, 10)
+
+    # deleting the log holding the heaviest set falls back to the other
+    response = client.delete(f"/workout_log/{first}", headers=headers)
+    assert response.status_code == 204
+    assert records(client, headers) == {
+        exercise: (60, 10, 10, 80, 80)
+    }
+
+
+def test_deleting_a_log_leaves_other_records_alone(
+    client: TestClient,
+):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id)
+    first, second = seed["exercise_ids"]
+    log = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 1, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, log, [(first, 5, 100)])
+    other = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 4, 8, tzinfo=timezone.utc),
+    )
+    add_sets(client, headers, other, [(second, 5, 50)])
+    before = client.get("/records/", headers=headers).json()
+
+    response = client.delete(f"/workout_log/{log}", headers=headers)
+    assert response.status_code == 204
+    # only the pairs the deleted sets held are recomputed
+    after = client.get("/records/", headers=headers).json()
+    assert after == [
+        record for record in before if record["exercise_id"] == second
+    ]
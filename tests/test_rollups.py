@@ -0,0 +1,182 @@
+from datetime import date, datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+import database  # noqa: E402
+from main import app  # noqa: E402
+from schemas.models import WorkoutRollup  # noqa: E402
+from training_data import (  # noqa: E402
+    add_sets,
+    create_log,
+    new_user,
+    seed_training,
+)
+from utility.rollups import (  # noqa: E402
+    ROLLUP_LOCK_KEY,
+    period_start,
+    rollup_rows,
+    rollups,
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_period_start():
+    # 2025-03-13 is a Thursday
+    assert period_start("week", date(2025, 3, 13)) == date(
+        2025, 3, 10
+    )
+    assert period_start("week", date(2025, 3, 10)) == date(
+        2025, 3, 10
+    )
+    assert period_start("month", date(2025, 3, 13)) == date(
+        2025, 3, 1
+    )
+
+
+def test_rollup_rows_read_only_committed_changes():
+    sql = str(
+        rollup_rows("month", 100, 200).compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+    assert "rollup_changes.txid >= 100" in sql
+    assert "rollup_changes.txid < 200" in sql
+    assert "CAST('1 month' AS INTERVAL)" in sql
+    assert "scheduled_workout.status = 'missed'" in sql
+
+
+def refresh() -> int:
+    with database.sessionLocal() as db:
+        return rollups.refresh(db)
+
+
+def totals(user_id: int, period: str, bucket: date) -> tuple | None:
+    with database.sessionLocal() as db:
+        rollup = db.get(WorkoutRollup, (user_id, period, bucket))
+        if rollup is None:
+            return None
+        return (
+            rollup.workouts,
+            rollup.duration_seconds,
+            rollup.sets,
+            rollup.volume,
+        )
+
+
+def test_refresh_keeps_rollups_in_step_with_writes(
+    client: TestClient,
+):
+    user_id, headers = new_user(client)
+    seed = seed_training(user_id, exercises=1)
+    exercise = seed["exercise_ids"][0]
+    # Wednesday and Saturday of the week starting Monday 2025-03-10
+    first = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 3, 12, 8, tzinfo=timezone.utc),
+    )
+    add_sets(
+        client,
+        headers,
+        first,
+        [(exercise, 5, 100), (exercise, 5, 100)],
+    )
+    second = create_log(
+        client,
+        headers,
+        seed,
+        datetime(2025, 3, 15, 8, tzinfo=timezone.utc),
+        minutes=30,
+    )
+    add_sets(client, headers, second, [(exercise, 10, 50)])
+
+    refresh()
+    assert totals(user_id, "week", date(2025, 3, 10)) == (
+        2,
+        5400,
+        3,
+        1500,
+    )
+    assert totals(user_id, "month", date(2025, 3, 1)) == (
+        2,
+        5400,
+        3,
+        1500,
+    )
+    response = client.get(
+        "/analytics/summary",
+        params={
+            "period": "week",
+            "start": "2025-03-10",
+            "end": "2025-03-16",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [row["volume"] for row in response.json()] == [1500]
+
+    # a later change to a bucket that was already refreshed
+    response = client.put(
+        f"/workout_log_items/{second}",
+        json={"weight": 80},
+        headers=headers,
+    )
+    assert response.status_code == 205
+
+    # another worker is refreshing, this run leaves everything as it is
+    with database.sessionLocal() as holder:
+        holder.execute(
+            select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY))
+        )
+        skipped = rollups.skipped
+        assert refresh() == 0
+        assert rollups.skipped == skipped + 1
+        assert totals(user_id, "week", date(2025, 3, 10)) == (
+            2,
+            5400,
+            3,
+            1500,
+        )
+        holder.rollback()
+
+    refresh()
+    assert totals(user_id, "week", date(2025, 3, 10)) == (
+        2,
+        5400,
+        3,
+        1800,
+    )
+
+    response = client.delete(f"/workout_log/{first}", headers=headers)
+    assert response.status_code == 204
+    refresh()
+    assert totals(user_id, "week", date(2025, 3, 10)) == (
+        1,
+        1800,
+        1,
+        800,
+    )
+
+    response = client.delete(
+        f"/workout_log/{second}", headers=headers
+    )
+    assert response.status_code == 204
+    refresh()
+    assert totals(user_id, "week", date(2025, 3, 10)) is None
+    assert totals(user_id, "month", date(2025, 3, 1)) is None
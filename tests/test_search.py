@@ -0,0 +1,38 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from main import app  # noqa: E402
+from training_data import new_user, seed_training  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_search_pages_walk_through_ties(client: TestClient):
+    user_id, headers = new_user(client)
+    # "exercise <n> <suffix>" for n < 10 all rank the same for the suffix
+    seed = seed_training(user_id, exercises=9)
+    search = seed["exercise_names"][0].split()[-1]
+    titles: list[str] = []
+    params = {"name": search, "limit": 5}
+    while True:
+        response = client.get(
+            "/exercise/", params=params, headers=headers
+        )
+        assert response.status_code == 200
+        titles += [row["title"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    # ties are broken by id, descending, without skipping or repeating
+    assert titles == seed["exercise_names"][::-1]
@@ -0,0 +1,43 @@
+import json
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+import utility.serialization as serialization  # noqa: E402
+from schemas.schemas import (  # noqa: E402
+    WorkoutLogResponse,
+    WorkoutStatus,
+)
+from utility.serialization import RowSerializer  # noqa: E402
+
+started = datetime(2025, 3, 1, 7, 30, 15, 120000, tzinfo=timezone.utc)
+rows = [
+    {
+        "plan_name": "Push day",
+        "scheduled_title": "Morning",
+        "status": WorkoutStatus.done,
+        "scheduled": started,
+        "started_at": started,
+        "ended_at": started,
+        "notes": "felt good",
+        "cursor_0": started,
+        "cursor_1": 10,
+    }
+]
+
+
+def test_dump_matches_validated_output():
+    serializer = RowSerializer(WorkoutLogResponse)
+    assert serializer.dump(rows) == serializer.validated(rows)
+
+
+def test_dump_without_orjson(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    serializer = RowSerializer(WorkoutLogResponse)
+    assert json.loads(serializer.dump(rows)) == json.loads(
+        serializer.validated(rows)
+    )
@@ -0,0 +1,51 @@
+import sys
+import os
+import time
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from schemas.schemas import UserSnapshot  # noqa: E402
+from utility.user_cache import UserCache  # noqa: E402
+
+
+def make_user(id: int) -> UserSnapshot:
+    return UserSnapshot(
+        id=id, email=f"user{id}@example.com", is_active=True
+    )
+
+
+def test_hit_and_miss_counters():
+    cache = UserCache(max_size=4, ttl_seconds=60)
+    assert cache.get(1) is None
+    cache.set(make_user(1))
+    assert cache.get(1) == make_user(1)
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    cache.set(make_user(1))
+    cache.set(make_user(2))
+    cache.get(1)
+    cache.set(make_user(3))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = UserCache(max_size=2, ttl_seconds=0.01)
+    cache.set(make_user(1))
+    time.sleep(0.02)
+    assert cache.get(1) is None
+
+
+def test_invalidate():
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    cache.set(make_user(1))
+    cache.invalidate(1)
+    assert cache.get(1) is None
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+import database
+from schemas.models import (
+    Exercise,
+    ExerciseCategory,
+    ScheduledWorkout,
+    WorkoutPlans,
+)
+
+
+def new_user(client: TestClient) -> tuple[int, dict]:
+    """Signs up a fresh user, so the data of a test is all it sees"""
+    email = f"{uuid4().hex[:12]}@example.com"
+    client.post(
+        "/users/signin", json={"email": email, "password": "12345678"}
+    )
+    token = client.post(
+        "/users/login", json={"email": email, "password": "12345678"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id: int = client.get(
+        "/users/protected", headers=headers
+    ).json()["id"]
+    return user_id, headers
+
+
+def seed_training(user_id: int, exercises: int = 2) -> dict:
+    """
+    Rows the API has no endpoint for or that are not under test: a
+    category, exercises, a public plan and a scheduled workout
+    """
+    suffix = uuid4().hex[:8]
+    with database.sessionLocal() as db:
+        category = ExerciseCategory(name=f"category {suffix}")
+        db.add(category)
+        db.flush()
+        created = [
+            Exercise(
+                name=f"exercise {number} {suffix}",
+                description="",
+                category_id=category.id,
+                owner_id=user_id,
+            )
+            for number in range(exercises)
+        ]
+        plan = WorkoutPlans(
+            user_id=user_id, title=f"plan {suffix}", is_public=True
+        )
+        db.add_all([*created, plan])
+        db.flush()
+        scheduled = ScheduledWorkout(
+            user_id=user_id,
+            plan_id=plan.id,
+            title=f"scheduled {suffix}",
+            scheduled_at=datetime.now(timezone.utc)
+            + timedelta(days=1),
+            duration_minutes=60,
+        )
+        db.add(scheduled)
+        db.commit()
+        return {
+            "exercise_ids": [exercise.id for exercise in created],
+            "exercise_names": [exercise.name for exercise in created],
+            "plan_id": plan.id,
+            "scheduled_id": scheduled.id,
+        }
+
+
+def create_log(
+    client: TestClient,
+    headers: dict,
+    seed: dict,
+    started_at: datetime,
+    minutes: int = 60,
+) -> int:
+    response = client.post(
+        "/workout_log/create_log",
+        json={
+            "plan_id": seed["plan_id"],
+            "scheduled_id": seed["scheduled_id"],
+            "started_at": started_at.isoformat(),
+            "ended_at": (
+                started_at + timedelta(minutes=minutes)
+            ).isoformat(),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+# sets are (exercise_id, reps, weight)
+def add_sets(
+    client: TestClient,
+    headers: dict,
+    log_id: int,
+    sets: list[tuple[int, int, float]],
+) -> None:
+    response = client.post(
+        "/workout_log_items/create_log_item",
+        json={
+            "log_id": log_id,
+            "items": [
+                {
+                    "exercise_id": exercise_id,
+                    "set_number": number,
+                    "reps": reps,
+                    "weight": weight,
+                }
+                for number, (exercise_id, reps, weight) in enumerate(
+                    sets, start=1
+                )
+            ],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+
+def private_plan(user_id: int) -> int:
+    with database.sessionLocal() as db:
+        plan = WorkoutPlans(
+            user_id=user_id,
+            title=f"private plan {uuid4().hex[:8]}",
+            is_public=False,
+        )
+        db.add(plan)
+        db.commit()
+        return plan.id
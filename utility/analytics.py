@@ -0,0 +1,218 @@
+import math
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy import Float, Select, cast, func, select
+from sqlalchemy.orm import Session
+
+from schemas.models import WorkoutLog, WorkoutLogItems
+
+SECONDS_PER_DAY = 86400
+# sessions averaged by the rolling e1RM
+ROLLING_SESSIONS = 5
+# days back from now the e1RM trend is fitted over
+TREND_DAYS = 90
+# no new best in the last PLATEAU_SESSIONS sessions, compared with at
+# least PLATEAU_HISTORY sessions before them
+PLATEAU_SESSIONS = 4
+PLATEAU_HISTORY = 4
+PLATEAU_TOLERANCE = 0.01
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+
+def sets_query(user_id: int) -> Select:
+    return (
+        select(
+            cast(func.extract("epoch", WorkoutLog.started_at), Float),
+            WorkoutLogItems.exercise_id,
+            WorkoutLogItems.reps,
+            cast(WorkoutLogItems.weight, Float),
+        )
+        .join_from(WorkoutLog, WorkoutLogItems, WorkoutLog.items)
+        .where(
+            WorkoutLog.user_id == user_id,
+            WorkoutLog.started_at.isnot(None),
+            WorkoutLogItems.exercise_id.isnot(None),
+            WorkoutLogItems.reps > 0,
+            WorkoutLogItems.weight > 0,
+        )
+    )
+
+
+class TrainingSets:
+    """
+    One user's weighted sets as columns, ordered by exercise and time.
+    A set is timed by the start of its log.
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        exercise_ids: np.ndarray,
+        reps: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        order = np.lexsort((timestamps, exercise_ids))
+        self.timestamps = timestamps[order]
+        self.exercise_ids = exercise_ids[order].astype(np.int64)
+        self.reps = reps[order]
+        self.weights = weights[order]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> "TrainingSets":
+        columns = np.fromiter(
+            chain.from_iterable(rows),
+            dtype=np.float64,
+            count=len(rows) * 4,
+        ).reshape(-1, 4)
+        return cls(*columns.T)
+
+    @classmethod
+    def load(cls, db: Session, user_id: int) -> "TrainingSets":
+        return cls.from_rows(db.execute(sets_query(user_id)).all())
+
+
+def epley(weights: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    return weights * (1 + reps / 30)
+
+
+def workload(sets: TrainingSets, now: float) -> dict:
+    """
+    Volume of the last ACUTE_DAYS against the weekly average of the last
+    CHRONIC_DAYS, the acute:chronic workload ratio
+    """
+    volume = sets.reps * sets.weights
+    age = now - sets.timestamps
+    acute = float(volume[age < ACUTE_DAYS * SECONDS_PER_DAY].sum())
+    chronic = float(
+        volume[age < CHRONIC_DAYS * SECONDS_PER_DAY].sum()
+        / (CHRONIC_DAYS / 7)
+    )
+    return {
+        "acute_load": round(acute, 2),
+        "chronic_load": round(chronic, 2),
+        "acwr": round(acute / chronic, 3) if chronic else None,
+    }
+
+
+def _value(number: float) -> float | None:
+    return None if math.isnan(number) else round(number, 2)
+
+
+def progression(
+    sets: TrainingSets,
+    now: float,
+    window: int = ROLLING_SESSIONS,
+) -> dict:
+    """
+    Per exercise the best e1RM (Epley), its rolling mean over the last
+    window sessions, the weekly trend over TREND_DAYS and whether it
+    has plateaued. A session is one exercise on one UTC day. Runs in a
+    fixed number of array passes, not loops over sets.
+    """
+    result = {
+        "sets": len(sets),
+        **workload(sets, now),
+        "exercises": [],
+    }
+    if not len(sets):
+        return result
+
+    # sessions: runs of equal (exercise, day) in the sorted sets
+    days = sets.timestamps // SECONDS_PER_DAY
+    new_session = np.ones(len(sets), dtype=bool)
+    new_session[1:] = (
+        sets.exercise_ids[1:] != sets.exercise_ids[:-1]
+    ) | (days[1:] != days[:-1])
+    starts = np.flatnonzero(new_session)
+    best = np.maximum.reduceat(epley(sets.weights, sets.reps), starts)
+    session_days = days[starts]
+    session_exercises = sets.exercise_ids[starts]
+
+    # exercises: runs of equal exercise in the sessions
+    new_exercise = np.ones(len(starts), dtype=bool)
+    new_exercise[1:] = session_exercises[1:] != session_exercises[:-1]
+    group = np.cumsum(new_exercise) - 1
+    first = np.flatnonzero(new_exercise)
+    counts = np.diff(np.append(first, len(starts)))
+    last = first + counts - 1
+
+    # rolling mean within each exercise from prefix sums
+    index = np.arange(len(starts))
+    low = np.maximum(index - window + 1, first[group])
+    sums = np.concatenate(([0.0], np.cumsum(best)))
+    rolling = (sums[index + 1] - sums[low]) / (index + 1 - low)
+
+    # least squares slope of e1RM over weeks, per exercise
+    today = now // SECONDS_PER_DAY
+    recent = session_days > today - TREND_DAYS
+    weeks = (session_days[recent] - today) / 7
+    y = best[recent]
+    g = group[recent]
+    size = len(first)
+    n = np.bincount(g, minlength=size)
+    sx = np.bincount(g, weeks, minlength=size)
+    sy = np.bincount(g, y, minlength=size)
+    sxx = np.bincount(g, weeks * weeks, minlength=size)
+    sxy = np.bincount(g, weeks * y, minlength=size)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(
+            (n >= 2) & (denominator > 0),
+            (n * sxy - sx * sy) / denominator,
+            np.nan,
+        )
+
+    # plateau: the last sessions do not beat the best before them
+    from_end = counts[group] - (index - first[group])
+    latest = from_end <= PLATEAU_SESSIONS
+    before = np.maximum.reduceat(
+        np.where(latest, -np.inf, best), first
+    )
+    since = np.maximum.reduceat(
+        np.where(latest, best, -np.inf), first
+    )
+    plateau = (counts >= PLATEAU_SESSIONS + PLATEAU_HISTORY) & (
+        since <= before * (1 + PLATEAU_TOLERANCE)
+    )
+
+    best_ever = np.maximum.reduceat(best, first)
+    result["exercises"] = [
+        {
+            "exercise_id": exercise_id,
+            "sessions": sessions,
+            "best_e1rm": _value(top),
+            "rolling_e1rm": _value(mean),
+            "trend_per_week": _value(trend),
+            "plateau": stalled,
+            "last_trained": datetime.fromtimestamp(
+                day * SECONDS_PER_DAY, timezone.utc
+            ).date(),
+        }
+        for exercise_id, sessions, top, mean, trend, stalled, day in zip(
+            session_exercises[first].tolist(),
+            counts.tolist(),
+            best_ever.tolist(),
+            rolling[last].tolist(),
+            slope.tolist(),
+            plateau.tolist(),
+            session_days[last].tolist(),
+        )
+    ]
+    return result
+
+
+def user_progression(
+    db: Session, user_id: int, window: int = ROLLING_SESSIONS
+) -> dict:
+    return progression(
+        TrainingSets.load(db, user_id),
+        datetime.now(timezone.utc).timestamp(),
+        window,
+    )
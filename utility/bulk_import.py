@@ -0,0 +1,254 @@
+import csv
+import io
+import json
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncIterator, Iterator
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import (
+    DECIMAL,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    insert,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from schemas.models import Exercise, WorkoutItems, WorkoutLogItems
+from schemas.schemas import WorkoutLogItemCreate
+
+# rows validated and copied per round trip, bounds the memory per import
+IMPORT_CHUNK_ROWS = 5000
+# error details kept for the response, the rest is only counted
+MAX_REPORTED_ERRORS = 100
+# upload bytes kept in memory before the spool moves to a temp file
+SPOOL_MEMORY_BYTES = 1024 * 1024
+INT_MAX = 2**31 - 1
+
+FIELDS: list[str] = list(WorkoutLogItemCreate.model_fields)
+
+# lives only for the importing transaction, kept out of Base.metadata
+staging = Table(
+    "log_items_staging",
+    MetaData(),
+    Column("row_number", Integer),
+    Column("exercise_id", Integer),
+    Column("workout_item_id", Integer),
+    Column("set_number", Integer),
+    Column("reps", Integer),
+    Column("weight", DECIMAL(5, 2)),
+    Column("notes", String(300)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class ImportReport:
+    def __init__(self) -> None:
+        self.rows = 0
+        self.valid = 0
+        self.errors_count = 0
+        self.errors: list[dict] = []
+
+    def reject(self, row: int, errors: list) -> None:
+        self.errors_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+
+async def spool_body(stream: AsyncIterator[bytes]) -> IO[bytes]:
+    """
+    Reads the whole upload before the import opens a transaction, so a
+    slow client never holds a pooled connection or a threadpool thread
+    """
+    spool = SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    try:
+        async for chunk in stream:
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def spooled_lines(spool: IO[bytes]) -> Iterator[str]:
+    return io.TextIOWrapper(spool, encoding="utf-8", newline="")
+
+
+# yields the row number with a dict per row, or the error that made the
+# row unreadable. A file that can not be read to the end is rejected as
+# a whole, never imported in part.
+def parse_rows(
+    lines: Iterator[str], ndjson: bool
+) -> Iterator[tuple[int, dict | Exception]]:
+    try:
+        if ndjson:
+            # numbered by line, blank lines included
+            for number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as error:
+                    yield number, error
+            return
+        reader = csv.DictReader(lines)
+        try:
+            for number, row in enumerate(reader, start=1):
+                # empty cells are missing values, not empty strings
+                yield number, {
+                    key: value or None for key, value in row.items()
+                }
+        except csv.Error as error:
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    f"Unreadable CSV after line {reader.line_num}, "
+                    f"nothing was imported: {error}"
+                ),
+            )
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=422,
+            detail="Upload is not valid UTF-8, nothing was imported",
+        )
+
+
+# checks the limits of the columns so a single row can not fail COPY
+def column_error(item: WorkoutLogItemCreate) -> str | None:
+    numbers = (
+        item.exercise_id,
+        item.workout_item_id or 0,
+        item.set_number,
+        item.reps,
+    )
+    if max(numbers) > INT_MAX:
+        return "Value is out of range"
+    if round(item.weight, 2) >= 1000:
+        return "Weight has to be less than 1000"
+    if item.notes and len(item.notes) > 300:
+        return "Notes are longer than 300 characters"
+    return None
+
+
+def copy_chunk(db: Session, rows: list[tuple]) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {staging.name} ({', '.join(staging.c.keys())}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def import_log_items(
+    db: Session,
+    log_id: int,
+    rows: Iterator[tuple[int, dict | Exception]],
+) -> dict:
+    """
+    Validates rows chunk by chunk, COPYs the valid ones into a staging
+    table and merges them into workout_log_items with one INSERT
+    """
+    report = ImportReport()
+    staging.create(db.connection())
+    chunk: list[tuple] = []
+    for number, data in rows:
+        report.rows += 1
+        if isinstance(data, Exception):
+            report.reject(number, [{"msg": str(data)}])
+            continue
+        try:
+            item = WorkoutLogItemCreate.model_validate(data)
+        except ValidationError as error:
+            report.reject(
+                number,
+                error.errors(
+                    include_url=False,
+                    include_context=False,
+                    include_input=False,
+                ),
+            )
+            continue
+        error = column_error(item)
+        if error:
+            report.reject(number, [{"msg": error}])
+            continue
+        report.valid += 1
+        chunk.append(
+            (number, *(getattr(item, field) for field in FIELDS))
+        )
+        if len(chunk) >= IMPORT_CHUNK_ROWS:
+            copy_chunk(db, chunk)
+            chunk.clear()
+    if chunk:
+        copy_chunk(db, chunk)
+
+    exercise_missing = Exercise.id.is_(None)
+    item_missing = and_(
+        staging.c.workout_item_id.isnot(None),
+        WorkoutItems.id.is_(None),
+    )
+    source = staging.outerjoin(
+        Exercise, Exercise.id == staging.c.exercise_id
+    ).outerjoin(
+        WorkoutItems, WorkoutItems.id == staging.c.workout_item_id
+    )
+    created = db.execute(
+        insert(WorkoutLogItems).from_select(
+            ["log_id", *FIELDS],
+            select(
+                literal(log_id),
+                *(staging.c[field] for field in FIELDS),
+            )
+            .select_from(source)
+            .where(~or_(exercise_missing, item_missing)),
+        )
+    ).rowcount
+    if created < report.valid:
+        rejected = db.execute(
+            select(
+                staging.c.row_number,
+                exercise_missing.label("exercise_missing"),
+            )
+            .select_from(source)
+            .where(or_(exercise_missing, item_missing))
+            .order_by(staging.c.row_number)
+            .limit(MAX_REPORTED_ERRORS)
+        ).all()
+        for row_number, no_exercise in rejected:
+            report.reject(
+                row_number,
+                [
+                    {
+                        "msg": (
+                            "Exercise doesn't exist"
+                            if no_exercise
+                            else "Workout item doesn't exist"
+                        )
+                    }
+                ],
+            )
+        report.errors_count += report.valid - created - len(rejected)
+    db.commit()
+    report.errors.sort(key=lambda error: error["row"])
+    return {
+        "log_id": log_id,
+        "rows_received": report.rows,
+        "items_created": created,
+        "errors_count": report.errors_count,
+        "errors": report.errors,
+    }
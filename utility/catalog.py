@@ -0,0 +1,177 @@
+import re
+from threading import Lock
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from schemas.models import Exercise, ExerciseCategory
+from schemas.schemas import PaginationParams
+from utility.etag import versions_query
+from utility.pagination import cursor_values
+
+CATALOG_TABLES = ("exercise", "exercise_category")
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+# the trigram set pg_trgm builds for similarity()
+def trigrams(text: str) -> frozenset[str]:
+    grams: set[str] = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(
+            padded[n : n + 3] for n in range(len(padded) - 2)
+        )
+    return frozenset(grams)
+
+
+def similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    common = len(left & right)
+    return common / (len(left) + len(right) - common)
+
+
+class CatalogEntry:
+    __slots__ = ("id", "row", "name", "grams")
+
+    def __init__(
+        self, id: int, category: str, title: str, description
+    ) -> None:
+        self.id = id
+        self.row = {
+            "category": category,
+            "title": title,
+            "description": description,
+        }
+        self.name = title.lower()
+        self.grams = trigrams(title)
+
+
+class CatalogSnapshot:
+    """
+    Global exercises with their categories, ordered by id, plus the
+    lowercase name and trigram index used by the name search
+    """
+
+    def __init__(
+        self, versions: tuple, entries: list[CatalogEntry]
+    ) -> None:
+        self.versions = versions
+        self.entries = entries
+        self.by_id = {entry.id: entry for entry in entries}
+
+    def get(self, id: int) -> list[dict]:
+        entry = self.by_id.get(id)
+        return [entry.row] if entry else []
+
+    # mirrors exercises_query for anonymous users
+    def list(
+        self,
+        pagination: PaginationParams,
+        search: str | None,
+        threshold: float,
+    ) -> list[dict]:
+        if not search:
+            after = cursor_values(pagination, [int])
+            if after is None:
+                page = self.entries[pagination.offset :]
+            else:
+                page = [e for e in self.entries if e.id > after[0]]
+            return [
+                {**entry.row, "cursor_0": entry.id}
+                for entry in page[: pagination.limit]
+            ]
+
+        needle = search.lower()
+        grams = trigrams(search)
+        matches: list[tuple[float, int, CatalogEntry]] = []
+        for entry in self.entries:
+            score = similarity(entry.grams, grams)
+            if needle in entry.name or score >= threshold:
+                matches.append((score, entry.id, entry))
+        matches.sort(key=lambda match: (match[0], match[1]), reverse=True)
+        after = cursor_values(pagination, [float, int])
+        if after is None:
+            matches = matches[pagination.offset :]
+        else:
+            matches = [m for m in matches if (m[0], m[1]) < tuple(after)]
+        return [
+            {**entry.row, "cursor_0": score, "cursor_1": id}
+            for score, id, entry in matches[: pagination.limit]
+        ]
+
+
+class Catalog:
+    """
+    In-process copy of the catalog for anonymous reads. It is stale once
+    the table_versions counters moved (any worker wrote) or a local
+    write called invalidate().
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = Lock()
+        # separate from _lock, which is held for the length of a load
+        self._stats_lock = Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def fresh(self, versions: Sequence) -> CatalogSnapshot | None:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.versions != tuple(
+            map(tuple, versions)
+        ):
+            return None
+        with self._stats_lock:
+            self.hits += 1
+        return snapshot
+
+    def load(self, db: Session) -> CatalogSnapshot:
+        with self._lock:
+            versions = tuple(
+                map(tuple, db.execute(versions_query(CATALOG_TABLES)))
+            )
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.versions == versions:
+                return snapshot
+            rows = db.execute(
+                select(
+                    Exercise.id,
+                    ExerciseCategory.name,
+                    Exercise.name,
+                    Exercise.description,
+                )
+                .join(ExerciseCategory.exercises)
+                .where(Exercise.is_global.is_(True))
+                .order_by(Exercise.id)
+            ).all()
+            snapshot = CatalogSnapshot(
+                versions, [CatalogEntry(*row) for row in rows]
+            )
+            self._snapshot = snapshot
+            with self._stats_lock:
+                self.loads += 1
+            return snapshot
+
+    def get(self, db: Session, versions: Sequence) -> CatalogSnapshot:
+        return self.fresh(versions) or self.load(db)
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        with self._stats_lock:
+            return {
+                "exercises": len(snapshot.entries) if snapshot else 0,
+                "versions": (
+                    dict(snapshot.versions) if snapshot else {}
+                ),
+                "loads": self.loads,
+                "hits": self.hits,
+            }
+
+
+catalog = Catalog()
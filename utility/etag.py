@@ -0,0 +1,63 @@
+from hashlib import blake2b
+from typing import Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import Select, select
+
+from schemas.models import TableVersion
+from settings import settings
+
+
+def versions_query(tables: Sequence[str]) -> Select:
+    return (
+        select(TableVersion.name, TableVersion.version)
+        .where(TableVersion.name.in_(tables))
+        .order_by(TableVersion.name)
+    )
+
+
+def make_etag(
+    request: Request, versions: Sequence, current_user
+) -> str:
+    key = blake2b(digest_size=16)
+    key.update(request.url.path.encode())
+    key.update(request.url.query.encode())
+    key.update(str(current_user.id if current_user else "").encode())
+    for name, version in versions:
+        key.update(f"{name}:{version}".encode())
+    return f'"{key.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header: str | None = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = [
+        tag.strip().removeprefix("W/") for tag in header.split(",")
+    ]
+    return "*" in tags or etag in tags
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    versions: Sequence,
+    current_user,
+) -> Response | None:
+    """
+    Sets ETag and Cache-Control on the response. Returns a 304 to send
+    instead when the client already has this version.
+    """
+    etag = make_etag(request, versions, current_user)
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Authorization"
+    response.headers["Cache-Control"] = (
+        "private, no-cache"
+        if current_user
+        else f"public, max-age={settings.CACHE_MAX_AGE_SECONDS}"
+    )
+    if etag_matches(request, etag):
+        return Response(
+            status_code=304, headers=dict(response.headers)
+        )
+    return None
@@ -0,0 +1,26 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from schemas.models import Exercise
+
+
+# every requested id has to exist, not just one of them
+def require_exercises(db: Session, ids: Iterable[int]) -> None:
+    requested: set[int] = set(ids)
+    found: set[int] = set(
+        db.execute(
+            select(Exercise.id).where(Exercise.id.in_(requested))
+        ).scalars()
+    )
+    missing: list[int] = sorted(requested - found)
+    if not requested or missing:
+        raise HTTPException(
+            status_code=404,
+            detail="Exercises are not found"
+            + (
+                f": {', '.join(map(str, missing))}" if missing else ""
+            ),
+        )
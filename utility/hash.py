@@ -1,14 +1,180 @@
+import asyncio
 import hashlib
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable
+
 import bcrypt
+from fastapi import HTTPException
+
+from settings import settings
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+DEFAULT_ROUNDS = 12
+
+# work factor used for new hashes, the same in every worker. It is
+# calibrated once per deployment with benchmarks/bcrypt_cost.py and
+# pinned with BCRYPT_ROUNDS
+bcrypt_rounds: int = settings.BCRYPT_ROUNDS or DEFAULT_ROUNDS
 
 
 # functio to create hashed password
-def hash_password(password: str):
+def hash_password(password: str, rounds: int | None = None):
     sha = hashlib.sha256(password.encode()).digest()
-    return bcrypt.hashpw(sha, bcrypt.gensalt()).decode()
+    salt = bcrypt.gensalt(rounds or bcrypt_rounds)
+    return bcrypt.hashpw(sha, salt).decode()
 
 
 # function to verify password
 def verify_password(user_password: str, db_hashed: str):
     sha = hashlib.sha256(user_password.encode()).digest()
     return bcrypt.checkpw(sha, db_hashed.encode())
+
+
+# cost factor is stored in the hash itself: $2b$<rounds>$<salt+hash>
+def get_rounds(db_hashed: str) -> int:
+    return int(db_hashed.split("$")[2])
+
+
+# only ever upgrades, a hash with a higher cost is kept as it is
+def needs_rehash(db_hashed: str) -> bool:
+    return get_rounds(db_hashed) < bcrypt_rounds
+
+
+# function to measure seconds per hash for the given cost
+def time_hash(rounds: int, samples: int = 3) -> float:
+    sha = hashlib.sha256(b"calibration").digest()
+    best = float("inf")
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds)
+        start = perf_counter()
+        bcrypt.hashpw(sha, salt)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """
+    Returns the highest cost whose hash time stays within target_ms.
+    Every extra round doubles the work, so only the first level is timed.
+    """
+    seconds = time_hash(MIN_ROUNDS)
+    rounds = MIN_ROUNDS
+    while rounds < MAX_ROUNDS and seconds * 2 * 1000 <= target_ms:
+        rounds += 1
+        seconds *= 2
+    return rounds
+
+
+class HashPool:
+    """
+    Bounded executor for bcrypt work, kept apart from the threadpool
+    that serves sync routes
+    """
+
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(
+                "HASH_POOL_KIND has to be thread or process"
+            )
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._lock = Lock()
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server is busy, try again later",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.max_pending_seen = max(
+                self.max_pending_seen, self.pending
+            )
+        start = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_executor(), fn, *args
+            )
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.total_seconds += perf_counter() - start
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "kind": self.kind,
+                "bcrypt_rounds": bcrypt_rounds,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "max_pending_seen": self.max_pending_seen,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_seconds": (
+                    self.total_seconds / done if done else 0.0
+                ),
+            }
+
+
+hash_pool = HashPool(
+    kind=settings.HASH_POOL_KIND,
+    workers=settings.HASH_POOL_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.HASH_POOL_MAX_PENDING,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(hash_password, password, bcrypt_rounds)
+
+
+async def verify_password_async(
+    user_password: str, db_hashed: str
+) -> bool:
+    return await hash_pool.run(
+        verify_password, user_password, db_hashed
+    )
@@ -1,13 +1,18 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from jose import JWTError, jwt
+from sqlalchemy import RowMapping, Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
-from database import get_db
+from database import get_async_db, get_db
 from schemas import models
-from schemas.schemas import TokenData
+from schemas.schemas import TokenData, UserSnapshot
 from settings import settings
 from typing import Any
+from utility.refresh_token import revoke_refresh_tokens
+from utility.revocation import revocations
+from utility.user_cache import user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 optional_oauth2_scheme = OAuth2PasswordBearer(
@@ -30,6 +35,16 @@ def create_access_token(data: dict) -> str:
     return encoded
 
 
+def token_claims(user: models.User | UserSnapshot) -> dict:
+    claims: dict = {"user_id": user.id, "ver": user.token_version}
+    # stateless mode carries everything routers need in the token
+    if settings.AUTH_STATELESS:
+        claims.update(
+            {"email": user.email, "is_active": user.is_active}
+        )
+    return claims
+
+
 def verify_access_token(token: str, credential_exception) -> dict:
     try:
         payload: dict = jwt.decode(
@@ -38,33 +53,182 @@ def verify_access_token(token: str, credential_exception) -> dict:
         id = payload.get("user_id")
         if not id:
             raise credential_exception
-        token_data: Any = TokenData(id=str(id))  # type: ignore
+        token_data: Any = TokenData(
+            id=str(id),  # type: ignore
+            email=payload.get("email"),
+            is_active=payload.get("is_active"),
+            ver=payload.get("ver", 0),
+        )
     except JWTError:
         raise credential_exception
     return token_data
 
 
+def user_query(user_id: int) -> Select:
+    return select(
+        models.User.id,
+        models.User.email,
+        models.User.is_active,
+        models.User.token_version,
+    ).where(models.User.id == user_id)
+
+
+def cache_user(row: RowMapping | None) -> UserSnapshot | None:
+    if not row:
+        return None
+    user = UserSnapshot(**row)
+    user_cache.set(user)
+    return user
+
+
+def load_user(user_id: int, db: Session) -> UserSnapshot | None:
+    user: UserSnapshot | None = user_cache.get(user_id)
+    if user:
+        return user
+    return cache_user(
+        db.execute(user_query(user_id)).mappings().first()
+    )
+
+
+async def load_user_async(
+    user_id: int, db: AsyncSession
+) -> UserSnapshot | None:
+    user: UserSnapshot | None = user_cache.get(user_id)
+    if user:
+        return user
+    result = await db.execute(user_query(user_id))
+    return cache_user(result.mappings().first())
+
+
+# returns the principal straight from the claims in stateless mode
+def principal_from_token(token_d: Any) -> UserSnapshot | None:
+    if settings.AUTH_STATELESS and token_d.email is not None:
+        return UserSnapshot(
+            id=token_d.id,
+            email=token_d.email,
+            is_active=token_d.is_active,
+            token_version=token_d.ver,
+        )
+    return None
+
+
+def check_version(
+    user: UserSnapshot | None, token_d: Any
+) -> UserSnapshot | None:
+    if not user or user.token_version > token_d.ver:
+        return None
+    return user
+
+
+def resolve_user(token_d: Any, db: Session) -> UserSnapshot | None:
+    if revocations.is_revoked(token_d.id, token_d.ver):
+        return None
+    user: UserSnapshot | None = principal_from_token(token_d)
+    if user:
+        return user
+    return check_version(load_user(token_d.id, db), token_d)
+
+
+async def resolve_user_async(
+    token_d: Any, db: AsyncSession
+) -> UserSnapshot | None:
+    if revocations.is_revoked(token_d.id, token_d.ver):
+        return None
+    user: UserSnapshot | None = principal_from_token(token_d)
+    if user:
+        return user
+    return check_version(
+        await load_user_async(token_d.id, db), token_d
+    )
+
+
+def revoke_tokens(db: Session, user_id: int, **values: Any) -> int:
+    """
+    Bumps users.token_version (and applies extra column values), which
+    invalidates every access token issued to the user so far
+    """
+    version: int = db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(token_version=models.User.token_version + 1, **values)
+        .returning(models.User.token_version)
+    ).scalar_one()
+    revoke_refresh_tokens(db, user_id)
+    db.commit()
+    revocations.revoke(user_id, version)
+    user_cache.invalidate(user_id)
+    return version
+
+
+# the user id keys read-your-writes, see database.read_session
+def remember_user(
+    request: Request, user: UserSnapshot | None
+) -> UserSnapshot | None:
+    if user:
+        request.state.user_id = user.id
+    return user
+
+
 def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> dict:
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> UserSnapshot:
     credential_exception = HTTPException(
         status_code=401,
         detail="Unathorized",
         headers={"WWW-Authenticate": "Bearer"},
     )
     token_d: dict = verify_access_token(token, credential_exception)
-    user: dict = (
-        db.query(models.User)
-        .filter(models.User.id == token_d.id)  # type: ignore
-        .first()
-    )
-    return user
+    user: UserSnapshot | None = resolve_user(token_d, db)
+    if not user:
+        raise credential_exception
+    return remember_user(request, user)
 
 
 def get_optional_user(
+    request: Request,
     token: str = Depends(optional_oauth2_scheme),
     db: Session = Depends(get_db),
-):
+) -> UserSnapshot | None:
+    if token is None:
+        return None
+    try:
+        credential_exception = HTTPException(
+            status_code=401,
+            detail="Unauthorized",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        token_d: dict = verify_access_token(
+            token, credential_exception
+        )
+        return remember_user(request, resolve_user(token_d, db))
+    except Exception:
+        return None
+
+
+async def get_current_user_async(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserSnapshot:
+    credential_exception = HTTPException(
+        status_code=401,
+        detail="Unathorized",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    token_d: dict = verify_access_token(token, credential_exception)
+    user: UserSnapshot | None = await resolve_user_async(token_d, db)
+    if not user:
+        raise credential_exception
+    return remember_user(request, user)
+
+
+async def get_optional_user_async(
+    request: Request,
+    token: str = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserSnapshot | None:
     if token is None:
         return None
     try:
@@ -76,11 +240,8 @@ def get_optional_user(
         token_d: dict = verify_access_token(
             token, credential_exception
         )
-        user = (
-            db.query(models.User)
-            .filter(models.User.id == token_d.id)  # type: ignore
-            .first()
+        return remember_user(
+            request, await resolve_user_async(token_d, db)
         )
-        return user
     except Exception:
         return None
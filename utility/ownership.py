@@ -0,0 +1,80 @@
+from typing import Any, NoReturn, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, Row, delete, select, update
+from sqlalchemy.orm import Session
+
+
+# only a miss pays for the extra query telling 403 from 404
+def _miss(
+    db: Session,
+    model,
+    where: ColumnElement[bool],
+    not_found: str,
+    forbidden: str | None,
+) -> NoReturn:
+    if (
+        forbidden is not None
+        and db.execute(select(model.id).where(where).limit(1)).first()
+    ):
+        raise HTTPException(status_code=403, detail=forbidden)
+    raise HTTPException(status_code=404, detail=not_found)
+
+
+def _write_owned(db: Session, statement, model) -> Sequence[Row]:
+    try:
+        rows: Sequence[Row] = db.execute(
+            statement.returning(model.id).execution_options(
+                synchronize_session=False
+            )
+        ).all()
+        if rows:
+            db.commit()
+        else:
+            db.rollback()
+    except Exception:
+        db.rollback()
+        raise
+    return rows
+
+
+def update_owned(
+    db: Session,
+    model,
+    where: ColumnElement[bool],
+    owned: ColumnElement[bool],
+    values: dict[str, Any],
+    not_found: str,
+    forbidden: str | None = None,
+) -> Sequence[Row]:
+    """
+    UPDATE ... WHERE <where> AND <owned> RETURNING id in one round trip.
+    On a miss answers 403 with forbidden if the row exists, otherwise
+    404 with not_found. Without forbidden every miss is a 404.
+    """
+    if values:
+        rows = _write_owned(
+            db,
+            update(model).where(where, owned).values(values),
+            model,
+        )
+    else:
+        rows = db.execute(select(model.id).where(where, owned)).all()
+    if not rows:
+        _miss(db, model, where, not_found, forbidden)
+    return rows
+
+
+def delete_owned(
+    db: Session,
+    model,
+    where: ColumnElement[bool],
+    owned: ColumnElement[bool],
+    not_found: str,
+    forbidden: str | None = None,
+) -> Sequence[Row]:
+    """DELETE counterpart of update_owned"""
+    rows = _write_owned(db, delete(model).where(where, owned), model)
+    if not rows:
+        _miss(db, model, where, not_found, forbidden)
+    return rows
@@ -0,0 +1,131 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import ColumnElement, RowMapping, Select, tuple_
+
+from schemas.schemas import PaginationParams
+
+CURSOR_LABEL = "cursor_"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["t"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(
+            cursor + "=" * (-len(cursor) % 4)
+        )
+        return [_decode_value(value) for value in json.loads(raw)]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _matches(value: Any, expected: type) -> bool:
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def _key_type(key: ColumnElement) -> type:
+    try:
+        return key.type.python_type
+    except NotImplementedError:
+        return object
+
+
+def cursor_values(
+    pagination: PaginationParams, types: Sequence[type]
+) -> list[Any] | None:
+    """
+    Decodes the cursor and checks it holds one value of the right type
+    per key, so a tampered cursor is a 400 and not a database error
+    """
+    if not pagination.cursor:
+        return None
+    values = decode_cursor(pagination.cursor)
+    if len(values) != len(types) or not all(
+        _matches(value, expected)
+        for value, expected in zip(values, types)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def paginate(
+    query: Select,
+    keys: Sequence[ColumnElement],
+    pagination: PaginationParams,
+    descending: bool = False,
+) -> Select:
+    """
+    Orders the query by keys (last one has to be unique) and continues
+    after the cursor instead of skipping rows with OFFSET. The keys are
+    added to the result as cursor_<n> columns for next_cursor.
+    """
+    query = query.add_columns(
+        *(
+            key.label(f"{CURSOR_LABEL}{n}")
+            for n, key in enumerate(keys)
+        )
+    )
+    values = cursor_values(
+        pagination, [_key_type(key) for key in keys]
+    )
+    if values is not None:
+        after = (
+            tuple_(*keys) < tuple(values)
+            if descending
+            else tuple_(*keys) > tuple(values)
+        )
+        query = query.where(after)
+    else:
+        query = query.offset(pagination.offset)
+    return query.order_by(
+        *(key.desc() if descending else key for key in keys)
+    ).limit(pagination.limit)
+
+
+def next_cursor(
+    rows: Sequence[RowMapping], pagination: PaginationParams
+) -> str | None:
+    if len(rows) < pagination.limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(
+        [
+            last[key]
+            for key in last.keys()
+            if str(key).startswith(CURSOR_LABEL)
+        ]
+    )
+
+
+def set_next_cursor(
+    response: Response,
+    rows: Sequence[RowMapping],
+    pagination: PaginationParams,
+) -> None:
+    cursor = next_cursor(rows, pagination)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
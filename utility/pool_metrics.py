@@ -0,0 +1,137 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# upper bounds in seconds of the checkout wait histogram buckets
+WAIT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class PoolMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.pool: QueuePool | None = None
+        self._lock = Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_buckets[bisect_left(WAIT_BUCKETS, seconds)] += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def stats(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            histogram: dict[str, int] = {}
+            cumulative = 0
+            for bound, hits in zip(
+                (*map(str, WAIT_BUCKETS), "+Inf"), self.wait_buckets
+            ):
+                cumulative += hits
+                histogram[bound] = cumulative
+            return {
+                "name": self.name,
+                "size": pool.size() if pool else None,
+                "checked_out": pool.checkedout() if pool else None,
+                "checked_in": pool.checkedin() if pool else None,
+                "overflow": pool.overflow() if pool else None,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_timeouts": self.timeouts,
+                "wait_seconds": {
+                    "count": self.wait_count,
+                    "sum": self.wait_sum,
+                    "max": self.wait_max,
+                    "buckets": histogram,
+                },
+            }
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+class TimedPoolMixin:
+    """
+    Times how long a caller waits for a connection. Pool events only fire
+    once a connection is handed out, so the wait is measured here.
+    """
+
+    def _do_get(self):
+        metrics = pool_metrics.get(self._orig_logging_name)  # type: ignore
+        start = perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore
+        except exc.TimeoutError:
+            if metrics:
+                metrics.observe_wait(perf_counter() - start, True)
+            raise
+        if metrics:
+            metrics.observe_wait(perf_counter() - start, False)
+        return connection
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def attach_pool_metrics(engine: Engine, name: str) -> PoolMetrics:
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+    metrics.pool = engine.pool  # type: ignore
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, proxy):
+        # engine.dispose() swaps the pool, keep pointing at the live one
+        metrics.pool = engine.pool  # type: ignore
+        metrics.count("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.count("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    return metrics
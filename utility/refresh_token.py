@@ -0,0 +1,131 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from schemas.models import RefreshToken, User
+from schemas.schemas import UserSnapshot
+from settings import settings
+
+
+# only the HMAC of a refresh token is stored, so a leaked table is useless
+def token_digest(token: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), token.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def prune_refresh_tokens(db: Session, user_id: int) -> None:
+    """
+    Deletes the expired tokens of the user. Revoked ones are kept for
+    REFRESH_TOKEN_REVOKED_DAYS so a stolen token replayed soon after a
+    rotation is still recognised as reused.
+    """
+    now = datetime.now(timezone.utc)
+    revoked_before = now - timedelta(
+        days=settings.REFRESH_TOKEN_REVOKED_DAYS
+    )
+    db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.user_id == user_id,
+            or_(
+                RefreshToken.expires_at < now,
+                RefreshToken.revoked_at < revoked_before,
+            ),
+        )
+    )
+
+
+# every login and rotation also prunes the user's old tokens
+def issue_refresh_token(db: Session, user_id: int) -> str:
+    prune_refresh_tokens(db, user_id)
+    token: str = secrets.token_urlsafe(32)
+    db.execute(
+        insert(RefreshToken).values(
+            user_id=user_id,
+            token_digest=token_digest(token),
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token
+
+
+def revoke_refresh_tokens(db: Session, user_id: int) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+
+def rotate_refresh_token(
+    db: Session, token: str
+) -> tuple[UserSnapshot, str]:
+    """
+    Exchanges a refresh token for a new one. Presenting a token that was
+    already rotated means it leaked, so every token of the user is revoked.
+    """
+    credential_exception = HTTPException(
+        status_code=401,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    row = (
+        db.execute(
+            select(
+                RefreshToken.id.label("token_id"),
+                RefreshToken.expires_at,
+                RefreshToken.revoked_at,
+                User.id,
+                User.email,
+                User.is_active,
+                User.token_version,
+            )
+            .join(RefreshToken.user)
+            .where(RefreshToken.token_digest == token_digest(token))
+        )
+        .mappings()
+        .first()
+    )
+    if not row:
+        raise credential_exception
+
+    now = datetime.now(timezone.utc)
+    if row["revoked_at"] is not None:
+        revoke_refresh_tokens(db, row["id"])
+        db.commit()
+        raise credential_exception
+    if row["expires_at"] <= now or not row["is_active"]:
+        raise credential_exception
+
+    revoked = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == row["token_id"],
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=now)
+        .returning(RefreshToken.id)
+    ).first()
+    # lost a race with a concurrent rotation of the same token
+    if not revoked:
+        db.rollback()
+        raise credential_exception
+
+    new_token: str = issue_refresh_token(db, row["id"])
+    db.commit()
+    user = UserSnapshot(
+        id=row["id"],
+        email=row["email"],
+        is_active=row["is_active"],
+        token_version=row["token_version"],
+    )
+    return user, new_token
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from itertools import count
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy.engine import Engine
+
+
+class ReplicaSelector:
+    """
+    Picks a replica engine per read, either round robin or the one with
+    the fewest checked out connections
+    """
+
+    def __init__(self, engines: list[Engine], strategy: str) -> None:
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(
+                "REPLICA_STRATEGY has to be round_robin or "
+                "least_connections"
+            )
+        self.engines = engines
+        self.strategy = strategy
+        self._counter = count()
+
+    def pick(self) -> Engine | None:
+        if not self.engines:
+            return None
+        if self.strategy == "least_connections":
+            return min(
+                self.engines,
+                key=lambda engine: engine.pool.checkedout(),  # type: ignore
+            )
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+class RecentWrites:
+    """
+    Remembers users that wrote within the last window seconds so their
+    reads go to the primary until the replicas have caught up
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._seen: OrderedDict[int, float] = OrderedDict()
+        self._lock = Lock()
+
+    def mark(self, user_id: int) -> None:
+        now = monotonic()
+        with self._lock:
+            self._seen[user_id] = now
+            self._seen.move_to_end(user_id)
+            # entries are ordered by write time, expired ones sit in front
+            while self._seen:
+                oldest = next(iter(self._seen.values()))
+                if now - oldest < self.window:
+                    break
+                self._seen.popitem(last=False)
+
+    def is_recent(self, user_id: int) -> bool:
+        written_at = self._seen.get(user_id)
+        return (
+            written_at is not None
+            and monotonic() - written_at < self.window
+        )
@@ -0,0 +1,42 @@
+from threading import Lock
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from schemas.models import User
+
+
+class TokenRevocations:
+    """
+    Minimal valid token version per user. Tokens issued with an older
+    version were revoked by logout or deactivation.
+    """
+
+    def __init__(self) -> None:
+        self._min_version: dict[int, int] = {}
+        self._lock = Lock()
+
+    def revoke(self, user_id: int, version: int) -> None:
+        with self._lock:
+            if version > self._min_version.get(user_id, 0):
+                self._min_version[user_id] = version
+
+    def is_revoked(self, user_id: int, version: int) -> bool:
+        return version < self._min_version.get(user_id, 0)
+
+    def load(self, db: Session) -> None:
+        rows = db.execute(
+            select(User.id, User.token_version).where(
+                User.token_version > 0
+            )
+        ).all()
+        with self._lock:
+            for user_id, version in rows:
+                if version > self._min_version.get(user_id, 0):
+                    self._min_version[user_id] = version
+
+    def __len__(self) -> int:
+        return len(self._min_version)
+
+
+revocations = TokenRevocations()
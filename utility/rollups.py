@@ -0,0 +1,306 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal
+
+from sqlalchemy import (
+    TIMESTAMP,
+    BigInteger,
+    ColumnElement,
+    Date,
+    Interval,
+    Select,
+    Text,
+    and_,
+    cast,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from schemas.models import (
+    RollupChange,
+    RollupWatermark,
+    ScheduledWorkout,
+    WorkoutLog,
+    WorkoutLogItems,
+    WorkoutRollup,
+)
+from schemas.schemas import WorkoutStatus
+
+Period = Literal["week", "month"]
+PERIODS: tuple[Period, ...] = ("week", "month")
+ROLLUP_NAME = "workout_rollups"
+# pg_advisory lock key, one refresher at a time across workers
+ROLLUP_LOCK_KEY = 0x726F6C6C
+
+
+def period_start(period: Period, day: date) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def in_bucket(
+    column: ColumnElement, bucket: ColumnElement, period: Period
+) -> ColumnElement[bool]:
+    """
+    column within the UTC week or month starting at bucket, as a range
+    so the (user_id, <time>) indexes are used
+    """
+    start = func.timezone("UTC", cast(bucket, TIMESTAMP))
+    return and_(
+        column >= start,
+        column < start + cast(literal(f"1 {period}"), Interval),
+    )
+
+
+def touched_buckets(
+    period: Period, watermark: int, horizon: int
+) -> Select:
+    return (
+        select(
+            RollupChange.user_id,
+            cast(
+                func.date_trunc(
+                    period, cast(RollupChange.touched_on, TIMESTAMP)
+                ),
+                Date,
+            ).label("bucket"),
+        )
+        .where(
+            RollupChange.txid >= watermark,
+            RollupChange.txid < horizon,
+        )
+        .distinct()
+    )
+
+
+def rollup_rows(
+    period: Period, watermark: int, horizon: int
+) -> Select:
+    """Totals of the touched buckets that still have any data"""
+    touched = touched_buckets(period, watermark, horizon).cte(
+        "touched"
+    )
+    logs = (
+        select(
+            touched.c.user_id,
+            touched.c.bucket,
+            func.count(WorkoutLog.id).label("workouts"),
+            func.sum(
+                func.extract(
+                    "epoch",
+                    WorkoutLog.ended_at - WorkoutLog.started_at,
+                )
+            )
+            .filter(WorkoutLog.ended_at > WorkoutLog.started_at)
+            .label("duration_seconds"),
+        )
+        .join(
+            WorkoutLog,
+            and_(
+                WorkoutLog.user_id == touched.c.user_id,
+                in_bucket(
+                    WorkoutLog.started_at, touched.c.bucket, period
+                ),
+            ),
+        )
+        .group_by(touched.c.user_id, touched.c.bucket)
+        .subquery("logs")
+    )
+    sets = (
+        select(
+            touched.c.user_id,
+            touched.c.bucket,
+            func.count(WorkoutLogItems.id).label("sets"),
+            func.sum(
+                WorkoutLogItems.reps * WorkoutLogItems.weight
+            ).label("volume"),
+        )
+        .join(
+            WorkoutLog,
+            and_(
+                WorkoutLog.user_id == touched.c.user_id,
+                in_bucket(
+                    WorkoutLog.started_at, touched.c.bucket, period
+                ),
+            ),
+        )
+        .join(WorkoutLog.items)
+        .group_by(touched.c.user_id, touched.c.bucket)
+        .subquery("sets")
+    )
+    schedules = (
+        select(
+            touched.c.user_id,
+            touched.c.bucket,
+            func.count()
+            .filter(ScheduledWorkout.status == WorkoutStatus.done)
+            .label("completed"),
+            func.count()
+            .filter(ScheduledWorkout.status == WorkoutStatus.missed)
+            .label("missed"),
+        )
+        .join(
+            ScheduledWorkout,
+            and_(
+                ScheduledWorkout.user_id == touched.c.user_id,
+                in_bucket(
+                    ScheduledWorkout.scheduled_at,
+                    touched.c.bucket,
+                    period,
+                ),
+            ),
+        )
+        .group_by(touched.c.user_id, touched.c.bucket)
+        .subquery("schedules")
+    )
+
+    def matches(totals) -> ColumnElement[bool]:
+        return and_(
+            totals.c.user_id == touched.c.user_id,
+            totals.c.bucket == touched.c.bucket,
+        )
+
+    return (
+        select(
+            touched.c.user_id,
+            literal(period).label("period"),
+            touched.c.bucket,
+            func.coalesce(logs.c.workouts, 0).label("workouts"),
+            func.round(
+                func.coalesce(logs.c.duration_seconds, 0)
+            ).label("duration_seconds"),
+            func.coalesce(sets.c.sets, 0).label("sets"),
+            func.coalesce(sets.c.volume, 0).label("volume"),
+            func.coalesce(schedules.c.completed, 0).label(
+                "completed"
+            ),
+            func.coalesce(schedules.c.missed, 0).label("missed"),
+        )
+        .select_from(touched)
+        .outerjoin(logs, matches(logs))
+        .outerjoin(sets, matches(sets))
+        .outerjoin(schedules, matches(schedules))
+        .where(
+            or_(
+                logs.c.user_id.isnot(None),
+                schedules.c.user_id.isnot(None),
+            )
+        )
+    )
+
+
+class RollupRefresher:
+    """
+    Recomputes the rollup buckets touched since the last run. Changes
+    below the watermark are done, it only moves up to the oldest
+    transaction still running, so a write committing late is picked up
+    by a later run instead of being skipped.
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.skipped = 0
+        self.buckets = 0
+        self.watermark: int | None = None
+        self.last_run_at: datetime | None = None
+
+    def refresh(self, db: Session) -> int:
+        if not db.scalar(
+            select(func.pg_try_advisory_xact_lock(ROLLUP_LOCK_KEY))
+        ):
+            db.rollback()
+            self.skipped += 1
+            return 0
+        horizon: int = db.scalar(
+            select(
+                cast(
+                    cast(
+                        func.pg_snapshot_xmin(
+                            func.pg_current_snapshot()
+                        ),
+                        Text,
+                    ),
+                    BigInteger,
+                )
+            )
+        )
+        watermark: int = (
+            db.scalar(
+                select(RollupWatermark.txid).where(
+                    RollupWatermark.name == ROLLUP_NAME
+                )
+            )
+            or 0
+        )
+        refreshed = 0
+        try:
+            for period in PERIODS:
+                touched = touched_buckets(period, watermark, horizon)
+                db.execute(
+                    delete(WorkoutRollup).where(
+                        WorkoutRollup.period == period,
+                        tuple_(
+                            WorkoutRollup.user_id,
+                            WorkoutRollup.bucket,
+                        ).in_(touched),
+                    )
+                )
+                refreshed += db.execute(
+                    insert(WorkoutRollup).from_select(
+                        [
+                            "user_id",
+                            "period",
+                            "bucket",
+                            "workouts",
+                            "duration_seconds",
+                            "sets",
+                            "volume",
+                            "completed",
+                            "missed",
+                        ],
+                        rollup_rows(period, watermark, horizon),
+                    )
+                ).rowcount
+            db.execute(
+                delete(RollupChange).where(
+                    RollupChange.txid < horizon
+                )
+            )
+            db.execute(
+                insert(RollupWatermark)
+                .values(name=ROLLUP_NAME, txid=horizon)
+                .on_conflict_do_update(
+                    index_elements=[RollupWatermark.name],
+                    set_={
+                        "txid": horizon,
+                        "refreshed_at": func.now(),
+                    },
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self.runs += 1
+        self.buckets += refreshed
+        self.watermark = horizon
+        self.last_run_at = datetime.now(timezone.utc)
+        return refreshed
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "buckets": self.buckets,
+            "watermark": self.watermark,
+            "last_run_at": self.last_run_at,
+        }
+
+
+rollups = RollupRefresher()
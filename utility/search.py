@@ -0,0 +1,36 @@
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    cast,
+    func,
+    select,
+)
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_THRESHOLD = 0.3
+
+
+def fuzzy_match(
+    column: InstrumentedAttribute, search: str
+) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """
+    Case-insensitive substring or trigram similarity match, both served
+    by the gin_trgm_ops index on the column. Returns the filter and the
+    similarity used to rank results, as float8 so the value a cursor
+    carries back compares equal to the one the row was ranked by.
+    """
+    substring = column.icontains(search, autoescape=True)
+    similar = column.op("%")(search)
+    rank = cast(func.similarity(column, search), Float(53))
+    return substring | similar, rank
+
+
+# pg_trgm reads the % operator threshold from a setting, scoped to the
+# current transaction here
+def threshold_statement(threshold: float) -> Select:
+    return select(
+        func.set_config(
+            "pg_trgm.similarity_threshold", str(threshold), True
+        )
+    )
@@ -0,0 +1,136 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+_PARAMS = re.compile(r"%\(\w+\)s|\$\d+|\?|\b\d+(\.\d+)?\b|'[^']*'")
+_PARAM_LISTS = re.compile(r"\?(\s*,\s*\?)+")
+_SPACES = re.compile(r"\s+")
+
+
+# statement shape with literals and bound parameters stripped out
+def fingerprint(statement: str) -> str:
+    shape = _PARAMS.sub("?", statement)
+    shape = _PARAM_LISTS.sub("?", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+class RequestStats:
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+        self.shapes[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (shape, times)
+            for shape, times in self.shapes.most_common()
+            if times > threshold
+        ]
+
+    def server_timing(self) -> str:
+        return (
+            f"db;dur={self.db_seconds * 1000:.2f};"
+            f'desc="{self.statements} statements"'
+        )
+
+
+class RouteStats:
+    """
+    Aggregated SQL counters per route, served by /metrics/sql
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[str, dict] = {}
+        self._lock = Lock()
+
+    def add(
+        self, route: str, stats: RequestStats, repeats: int
+    ) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "statements": 0,
+                    "db_seconds": 0.0,
+                    "max_statements": 0,
+                    "repeated_statement_warnings": 0,
+                },
+            )
+            entry["requests"] += 1
+            entry["statements"] += stats.statements
+            entry["db_seconds"] += stats.db_seconds
+            entry["max_statements"] = max(
+                entry["max_statements"], stats.statements
+            )
+            entry["repeated_statement_warnings"] += repeats
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    **entry,
+                    "avg_statements": entry["statements"]
+                    / entry["requests"],
+                    "avg_db_ms": entry["db_seconds"]
+                    * 1000
+                    / entry["requests"],
+                }
+                for route, entry in self._routes.items()
+            }
+
+
+current_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_stats", default=None
+)
+route_stats = RouteStats()
+
+
+def finish_request(route: str, stats: RequestStats) -> None:
+    repeated = stats.repeated(settings.SQL_REPEAT_WARN_THRESHOLD)
+    for shape, times in repeated:
+        logger.warning(
+            "%s ran the same statement %d times, possible N+1: %s",
+            route,
+            times,
+            shape,
+        )
+    route_stats.add(route, stats, len(repeated))
+
+
+# listeners on the Engine class cover the primary, replicas and the
+# sync engine behind the async one
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if context is not None:
+        context._sql_started_at = perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    stats: RequestStats | None = current_stats.get()
+    if stats is None:
+        return
+    started: float | None = getattr(context, "_sql_started_at", None)
+    stats.record(
+        statement, perf_counter() - started if started else 0.0
+    )
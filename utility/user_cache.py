@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy import event
+
+from schemas.models import User
+from schemas.schemas import UserSnapshot
+from settings import settings
+
+
+class UserCache:
+    """
+    LRU cache with TTL for authenticated user snapshots, keyed by user id
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[int, tuple[float, UserSnapshot]] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> UserSnapshot | None:
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= monotonic():
+                del self._data[user_id]
+                self.misses += 1
+                return None
+            self._data.move_to_end(user_id)
+            self.hits += 1
+            return snapshot
+
+    def set(self, snapshot: UserSnapshot) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[snapshot.id] = (
+                monotonic() + self.ttl_seconds,
+                snapshot,
+            )
+            self._data.move_to_end(snapshot.id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+# drop cached snapshot whenever a user row is changed through the ORM
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    user_cache.invalidate(target.id)